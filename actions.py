@@ -11,6 +11,16 @@ See https://github.com/xames3/charlotte for complete documentation.
 #
 #   < Checkout my github repo for history and latest stable build >
 #
+#   2.1.0 - `ActionWeatherEvent` now awaits `forecast_async`, hence a slow
+#           weather api does not block the other conversations. It no
+#           longer checks the internet & locates the user before the
+#           forecast, as `forecast_async` does both concurrently.
+#           Weather replies are now rendered using `replies` templates.
+#           `ActionWeatherEvent` now awaits `weather_async`, converts the
+#           hours slot to int & sets `current_city` & `query_weather_cond`.
+#           Only a missing internet connection is replied as no internet,
+#           rest of the errors are replied as unknown errors.
+#           Weather is said to be checked only after failing fast.
 #   1.1.0 - Reworked `ActionGreetUser` and replaced all weather related classes
 #           with `ActionWeatherEvent`.
 #           Added internal checks to measuree if the conditions are meeting or
@@ -28,17 +38,15 @@ from random import choice
 from rasa_sdk import Action
 from rasa_sdk.events import SlotSet
 
+from charlotte.core.weather import weather_async
 from charlotte.utils.actions.music import (play_music_using_metadata,
                                            play_next_track,
                                            play_previous_track,
                                            reply_on_playing)
-from charlotte.utils.actions.person import (greet_user,
-                                            locate)
-from charlotte.utils.actions.weather import weather_event
-from charlotte.utils.assists.phrases import (errors,
-                                             greetings_protocol,
-                                             weather_protocol)
-from charlotte.utils.assists.system import check_internet
+from charlotte.utils.actions.person import greet_user
+from charlotte.utils.assists.phrases import greetings_protocol
+from charlotte.utils.phrases import replies
+from charlotte.utils.system import connectivity
 
 
 class ActionGreetUser(Action):
@@ -74,7 +82,7 @@ class ActionWeatherEvent(Action):
     def name(self) -> str:
         return 'action_weather_event'
 
-    def run(self, dispatcher, tracker, domain) -> list:
+    async def run(self, dispatcher, tracker, domain) -> list:
         try:
             query_city = tracker.get_slot('query_city')
             query_hours = tracker.get_slot('query_hours')
@@ -88,39 +96,50 @@ class ActionWeatherEvent(Action):
                 units_imperial = False
             if is_charlotte_online is False:
                 _retry = True
-                _retrying = choice(weather_protocol['retrying'])
+                _retrying = replies.render('weather.retry')
                 dispatcher.utter_message(_retrying)
             else:
                 _retry = False
-            if check_internet():
-                current_city = locate('city')
-                if query_city is None:
-                    query_city = current_city
-                _query_resp, _query_cond = weather_event(city=query_city,
-                                                         hours=query_hours,
-                                                         minutes=query_minutes,
-                                                         imperial=units_imperial)
+            # Hours are extracted as text, hence they are converted
+            # before comparing them with the forecast limits.
+            try:
+                _hours = int(float(query_hours)) if query_hours else None
+            except ValueError:
+                _hours = None
+            if connectivity().failing():
+                # Fails fast, before saying the weather is being checked.
+                _query_resp = None
+            else:
                 if not is_weather_checked:
-                    _working_on_it = choice(weather_protocol['working_on_it'])
-                    _saying_okay = choice(weather_protocol['saying_okay'])
-                    _choice_resp = choice([_working_on_it, _saying_okay])
+                    _choice_resp = replies.render(choice(['weather.wait',
+                                                          'weather.okay']))
                     dispatcher.utter_message(_choice_resp)
+                # Awaiting the forecast, hence other conversations are
+                # served while the weather is fetched. Current location is
+                # used if the city is not asked.
+                try:
+                    _query_resp, _place, _cond = await weather_async(
+                        query_city, hours=_hours, metric=not units_imperial)
+                except ConnectionError:
+                    # Raised only if there is no internet connection, rest
+                    # of the errors are replied as unknown errors.
+                    _query_resp = None
+            if _query_resp is not None:
                 dispatcher.utter_message(_query_resp)
                 return [SlotSet('query_city', query_city),
                         SlotSet('query_hours', query_hours),
                         SlotSet('query_minutes', query_minutes),
-                        SlotSet('current_city', current_city),
-                        SlotSet('query_weather_cond', _query_cond),
+                        SlotSet('current_city', _place),
+                        SlotSet('query_weather_cond', _cond),
                         SlotSet('is_charlotte_online', True),
                         SlotSet('is_weather_checked', True),
                         SlotSet('units_imperial', units_imperial)]
             else:
                 if _retry:
-                    _still_no_internet = choice(
-                        weather_protocol['still_no_internet'])
+                    _still_no_internet = replies.render('weather.still')
                     dispatcher.utter_message(_still_no_internet)
                 else:
-                    _no_internet = choice(weather_protocol['no_internet'])
+                    _no_internet = replies.render('weather.no_internet')
                     dispatcher.utter_message(_no_internet)
                 return [SlotSet('query_city', None),
                         SlotSet('query_hours', None),
@@ -131,7 +150,9 @@ class ActionWeatherEvent(Action):
                         SlotSet('is_weather_checked', False),
                         SlotSet('units_imperial', False)]
         except Exception as error:
-            dispatcher.utter_message(error['unknown'])
+            print(f'An error occured while checking the weather because of '
+                  f'{error}.')
+            dispatcher.utter_message(replies.render('errors.unknown'))
             return [SlotSet('query_city', None),
                     SlotSet('query_hours', None),
                     SlotSet('query_minutes', None),
@@ -0,0 +1,89 @@
+"""
+The conditions benchmark: Compares the condition summary rewrites.
+
+This benchmark compares `normalize_condition` of the weather module
+against the previous chain of replacements of `forecast` on the corpus
+of the summaries returned by the api. It prints the time taken per
+summary & every summary which is rewritten differently, hence changes
+to `CONDITION_RULES` can be reviewed before they are shipped.
+
+Run it using `python -m charlotte.benchmarks.conditions`.
+
+See https://github.com/xames3/charlotte for cloning the repository.
+"""
+#   History:
+#
+#   < Checkout my GitHub repo for history and latest stable build >
+#
+#   2.1.0 - First code.
+
+from pathlib import Path
+from timeit import repeat
+from typing import List, Text, Tuple
+
+from charlotte.core.weather import normalize_condition
+
+CORPUS = Path(__file__).parent / 'conditions.txt'
+
+
+def _corpus(file: Text = CORPUS) -> List[Text]:
+    """Returns summaries from the corpus file, one per line."""
+    with open(file, encoding='utf-8') as corpus:
+        return [line.strip() for line in corpus if line.strip()]
+
+
+def _legacy(summary: Text) -> Text:
+    """Chain of replacements of `forecast` before the rules table."""
+    cond = summary.lower().strip('.')
+    if cond.startswith('possible'):
+        cond = cond.replace('possible', 'possible to have') + \
+            ' weather'
+    if cond.startswith('rain'):
+        cond = cond.replace('rain', 'rainy weather')
+    if cond.endswith('cloudy'):
+        cond = cond + ' weather'
+    if cond.startswith('light'):
+        cond = cond.replace('light', 'possible to have light') + \
+            ' weather'
+    if cond.startswith('heavy'):
+        cond = cond.replace('heavy', 'possible to have heavy') + \
+            ' weather'
+    return cond
+
+
+def diff(summaries: List[Text]) -> List[Tuple[Text, Text, Text]]:
+    """Returns summaries which are rewritten differently."""
+    return [(summary, _legacy(summary), normalize_condition(summary))
+            for summary in summaries
+            if _legacy(summary) != normalize_condition(summary)]
+
+
+def run(file: Text = CORPUS, number: int = 100) -> None:
+    """Runs the benchmark & prints the differences."""
+    summaries = _corpus(file)
+
+    def _cold() -> None:
+        normalize_condition.cache_clear()
+        for summary in summaries:
+            normalize_condition(summary)
+
+    def _warm() -> None:
+        for summary in summaries:
+            normalize_condition(summary)
+
+    timings = {'replacements': lambda: [_legacy(summary)
+                                        for summary in summaries],
+               'rules': _cold,
+               'rules (memoized)': _warm}
+    print(f'{len(summaries)} summaries')
+    for name, function in timings.items():
+        best = min(repeat(function, number=number, repeat=3)) / number
+        print(f'{name:>18} {best / len(summaries) * 1e9:>10.0f} ns')
+    changed = diff(summaries)
+    print(f'\n{len(changed)} summaries are rewritten differently')
+    for summary, legacy, normalized in changed:
+        print(f'  {summary}\n    - {legacy}\n    + {normalized}')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,110 @@
+"""
+The dataset benchmark: Compares the in-memory & on-disk dataset tools.
+
+This benchmark compares the previous in-memory `sort_lines` &
+`randomize_lines` against the current ones, with the file fitting in the
+memory budget & with the file processed on the disk, on the synthetic
+utterance files of 200k & 1M lines. Time & the peak memory allocated by
+Python are printed for each.
+
+Run it using `python -m charlotte.benchmarks.dataset`.
+
+See https://github.com/xames3/charlotte for cloning the repository.
+"""
+#   History:
+#
+#   < Checkout my GitHub repo for history and latest stable build >
+#
+#   2.1.0 - First code.
+
+from os.path import getsize, join
+from random import Random
+from shutil import copyfile
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from tracemalloc import get_traced_memory, start, stop
+from typing import Callable, List, Text, Tuple
+
+from charlotte.utils.constants import ENCODING
+from charlotte.utils.dataset import randomize_lines, sort_lines
+
+SIZES = [200_000, 1_000_000]
+
+WORDS = ['play', 'some', 'music', 'by', 'the', 'weather', 'in', 'tomorrow',
+         'what', 'is', 'next', 'track', 'song', 'please', 'for', 'city']
+
+
+def _write(file: Text, count: int, seed: int = 0) -> None:
+    """Writes synthetic utterances, about 10% of them duplicated."""
+    random = Random(seed)
+    with open(file, 'w', encoding=ENCODING) as dst_file:
+        for _ in range(count):
+            words = random.choices(WORDS, k=random.randint(3, 9))
+            if random.random() < 0.9:
+                words.append(str(random.randrange(10 ** 9)))
+            dst_file.write(f'- {" ".join(words)}\n')
+
+
+def _legacy_sort(file: Text) -> None:
+    """`sort_lines` before the external merge sort."""
+    with open(file, encoding=ENCODING) as src_file:
+        new_list = sorted(set(src_file.readlines()))
+    with open(file, 'w', encoding=ENCODING) as src_file:
+        for line in new_list:
+            src_file.write(line)
+
+
+def _legacy_randomize(file: Text) -> None:
+    """`randomize_lines` before the shuffle on the disk."""
+    from random import shuffle
+
+    with open(file, encoding=ENCODING) as src_file:
+        new_list = list(set(src_file.readlines()))
+        shuffle(new_list)
+    with open(file, 'w', encoding=ENCODING) as src_file:
+        for line in new_list:
+            src_file.write(line)
+
+
+def _measure(function: Callable, source: Text,
+             file: Text) -> Tuple[float, float]:
+    """Returns seconds taken & peak MB allocated by the function."""
+    copyfile(source, file)
+    started = perf_counter()
+    function(file)
+    elapsed = perf_counter() - started
+    copyfile(source, file)
+    start()
+    function(file)
+    peak = get_traced_memory()[1] / 2 ** 20
+    stop()
+    return elapsed, peak
+
+
+def run(sizes: List[int] = SIZES) -> None:
+    """Runs the benchmark & prints time & peak memory of each."""
+    print(f'{"lines":>10} {"size":>8} {"function":>32} {"time":>9} '
+          f'{"peak":>9}')
+    for count in sizes:
+        with TemporaryDirectory() as temp:
+            source, file = join(temp, 'source.md'), join(temp, 'nlu.md')
+            _write(source, count)
+            size = getsize(source)
+            functions = {
+                'sort_lines (previous)': _legacy_sort,
+                'sort_lines (in memory)': sort_lines,
+                'sort_lines (16 MB budget)':
+                    lambda file: sort_lines(file, memory=16 * 2 ** 20),
+                'randomize_lines (previous)': _legacy_randomize,
+                'randomize_lines (in memory)': randomize_lines,
+                'randomize_lines (16 MB budget)':
+                    lambda file: randomize_lines(file,
+                                                 memory=16 * 2 ** 20)}
+            for name, function in functions.items():
+                elapsed, peak = _measure(function, source, file)
+                print(f'{count:>10} {size / 2 ** 20:>5.0f} MB {name:>32} '
+                      f'{elapsed:>7.2f} s {peak:>6.0f} MB')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,86 @@
+"""
+The filters benchmark: Compares the metadata filters of the catalog.
+
+This benchmark compares the single compiled query of the track catalog
+against the previous pandas filter loop of `play_music_using_metadata`
+on the synthetic music libraries of 10k, 100k & 1M rows.
+
+Run it using `python -m charlotte.benchmarks.filters`.
+
+See https://github.com/xames3/charlotte for cloning the repository.
+"""
+#   History:
+#
+#   < Checkout my GitHub repo for history and latest stable build >
+#
+#   2.1.0 - First code.
+
+from random import Random
+from tempfile import TemporaryDirectory
+from timeit import repeat
+from typing import Dict, List, Text, Tuple
+
+from charlotte.core.catalog import COLUMNS, Catalog
+
+SIZES = [10_000, 100_000, 1_000_000]
+
+CONSTRAINTS = {'track_artist': 'artist 7',
+               'track_genre': 'genre 3',
+               'track_year': '2001'}
+
+
+def _rows(count: int, seed: int = 0) -> List[Tuple]:
+    """Returns synthetic catalog rows."""
+    random = Random(seed)
+    rows = []
+    for idx in range(count):
+        rows.append((f'/music/{idx:07}.mp3', 0, 0, f'{idx:07}.mp3',
+                     f'track {idx}', f'artist {random.randrange(500)}', None,
+                     f'composer {random.randrange(300)}',
+                     f'album {random.randrange(2000)}',
+                     f'genre {random.randrange(20)}', '0:03:30',
+                     str(random.randrange(1970, 2020)), '5 MB'))
+    return rows
+
+
+def _legacy(df, constraints: Dict[Text, Text]) -> List[Text]:
+    """Filter loop of `play_music_using_metadata` before the catalog."""
+    from random import randint
+    from numpy import ones
+    from pandas import Series
+
+    filter_series = Series(ones(df.shape[0], dtype=bool))
+    for column, value in constraints.items():
+        filter_series = ((df[column] == value) & filter_series)
+    track_list = df[filter_series]['music_file'].tolist()
+    if len(df[filter_series]) > 1:
+        pick = df[filter_series].iloc[randint(0, len(df[filter_series]) - 1),
+                                      0]
+        return track_list[track_list.index(pick) - 1:]
+    elif len(df[filter_series]) == 1:
+        return track_list
+    return []
+
+
+def run(sizes: List[int] = SIZES, number: int = 10) -> None:
+    """Runs the benchmark & prints best time per request."""
+    from pandas import DataFrame
+
+    print(f'{"rows":>10} {"pandas loop":>14} {"compiled query":>16}')
+    for count in sizes:
+        rows = _rows(count)
+        df = DataFrame([row[3:] for row in rows], columns=COLUMNS)
+        with TemporaryDirectory() as temp:
+            catalog = Catalog(f'{temp}/library.db')
+            catalog.store(rows)
+            legacy = min(repeat(lambda: _legacy(df, CONSTRAINTS),
+                                number=number, repeat=3)) / number
+            compiled = min(repeat(lambda: catalog.filter(**CONSTRAINTS),
+                                  number=number, repeat=3)) / number
+            catalog.close()
+        print(f'{count:>10} {legacy * 1000:>11.2f} ms '
+              f'{compiled * 1000:>13.2f} ms')
+
+
+if __name__ == '__main__':
+    run()
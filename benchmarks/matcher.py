@@ -0,0 +1,119 @@
+"""
+The matcher benchmark: Compares the fuzzy matchers.
+
+This benchmark compares the previous `fuzzywuzzy` based `find_string`
+against `match`, `match_many` & `ChoiceSet` of the matcher module on
+the synthetic lists of 1k & 10k file names.
+
+Run it using `python -m charlotte.benchmarks.matcher`.
+
+Note: `fuzzywuzzy` is no longer a requirement, hence the previous flow
+of extracting the guesses & rescoring the best one is always run using
+`rapidfuzz` as the baseline. The previous matcher itself is run only if
+`fuzzywuzzy` is installed, `pip install fuzzywuzzy`.
+
+See https://github.com/xames3/charlotte for cloning the repository.
+"""
+#   History:
+#
+#   < Checkout my GitHub repo for history and latest stable build >
+#
+#   2.1.0 - First code.
+
+from random import Random
+from timeit import repeat
+from typing import List, Optional, Text
+
+from charlotte.utils.matcher import ChoiceSet, match, match_many
+
+SIZES = [1_000, 10_000]
+
+WORDS = ['love', 'night', 'summer', 'blue', 'heart', 'fire', 'rain', 'road',
+         'dream', 'city', 'light', 'home', 'river', 'gold', 'wild', 'star']
+
+
+def _choices(count: int, seed: int = 0) -> List[Text]:
+    """Returns synthetic file names."""
+    random = Random(seed)
+    return [f'{idx:05} - {" ".join(random.sample(WORDS, 3)).title()}.mp3'
+            for idx in range(count)]
+
+
+def _queries(choices: List[Text], count: int = 20,
+             seed: int = 1) -> List[Text]:
+    """Returns misspelled names of few of the choices."""
+    random = Random(seed)
+    queries = []
+    for choice in random.sample(choices, count):
+        name = choice[8:-4].lower()
+        idx = random.randrange(len(name))
+        queries.append(name[:idx] + name[idx + 1:])
+    return queries
+
+
+def _baseline(string: Text, string_list: List[Text],
+              min_score: Optional[int] = 70) -> Text:
+    """`find_string` before the matcher module, using `rapidfuzz`."""
+    from rapidfuzz.fuzz import partial_ratio
+    from rapidfuzz.process import extract
+    from rapidfuzz.utils import default_process
+
+    guessed = extract(string, string_list, limit=3, scorer=partial_ratio,
+                      processor=default_process)
+    for best_guess in guessed:
+        current_score = partial_ratio(string, best_guess[0])
+        if current_score > min_score and current_score > 0:
+            return best_guess[0]
+        else:
+            return f'Sorry, I could not find "{string}" in given list.'
+
+
+def _legacy(string: Text, string_list: List[Text],
+            min_score: Optional[int] = 70) -> Text:
+    """`find_string` before the matcher module."""
+    from fuzzywuzzy.fuzz import partial_ratio
+    from fuzzywuzzy.process import extract
+
+    guessed = extract(string, string_list, limit=3, scorer=partial_ratio)
+    for best_guess in guessed:
+        current_score = partial_ratio(string, best_guess)
+        if current_score > min_score and current_score > 0:
+            return best_guess[0]
+        else:
+            return f'Sorry, I could not find "{string}" in given list.'
+
+
+def run(sizes: List[int] = SIZES, number: int = 3) -> None:
+    """Runs the benchmark & prints best time per query."""
+    try:
+        import fuzzywuzzy  # noqa: F401
+        legacy = True
+    except ImportError:
+        legacy = False
+    print(f'{"choices":>10} {"baseline":>12} {"fuzzywuzzy":>12} '
+          f'{"match":>12} {"match_many":>12} {"choice set":>12}')
+    for count in sizes:
+        choices = _choices(count)
+        queries = _queries(choices)
+        timings = [lambda: [_baseline(query, choices) for query in queries]]
+        if legacy:
+            timings.append(lambda: [_legacy(query, choices)
+                                    for query in queries])
+        timings.append(lambda: [match(query, choices) for query in queries])
+        timings.append(lambda: match_many(queries, choices))
+        # Choices are normalized once, like the window titles or the
+        # files of the music directory between the requests.
+        choice_set = ChoiceSet(choices)
+        timings.append(lambda: [choice_set.match(query)
+                                for query in queries])
+        best = [min(repeat(timing, number=number, repeat=3)) / number /
+                len(queries) for timing in timings]
+        if not legacy:
+            best.insert(1, None)
+        print(f'{count:>10} ' + ' '.join(
+            f'{"-":>12}' if value is None else f'{value * 1000:>9.3f} ms'
+            for value in best))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,344 @@
+"""
+The catalog module: Provides the persistent music track catalog.
+
+The catalog stores the music files and their metadata in a SQLite
+database with indexes on the commonly searched columns. It replaces the
+use of music csv file for the lookups, hence each request becomes an
+indexed query instead of parsing the entire csv file.
+
+At a glance, the structure of the module is following:
+ - Catalog():           SQLite backed track catalog. Provides methods to
+                        store, remove and look up the tracks. Artist,
+                        album, genre, year & composer columns are
+                        indexed.
+ - compile_filter():    Compiles the non-null constraints into a single
+                        SQL query which returns the matching tracks
+                        along with their neighbouring tracks.
+ - open_catalog():      Returns the catalog opened for the given path.
+                        The catalog is opened once & is reused by every
+                        subsequent call.
+ - export_csv():        Streams the catalog to the music csv file with
+                        the same header layout. The file is replaced
+                        atomically once it is completely written.
+ - import_csv():        Imports the music csv file with the existing
+                        header layout into the catalog. This is a one
+                        shot importer for the previously generated csv
+                        files.
+
+See https://github.com/xames3/charlotte for cloning the repository.
+"""
+#   History:
+#
+#   < Checkout my GitHub repo for history and latest stable build >
+#
+#   2.1.0 - First code.
+
+import sqlite3
+from functools import lru_cache
+from pathlib import Path
+from threading import RLock
+from typing import (Dict, Iterable, Iterator, List, Optional, Text,
+                    Tuple)
+
+from charlotte.utils.constants import ENCODING
+from charlotte.utils.paths import files, local
+from charlotte.utils.system import atomic_write, make_dir
+
+# Headers of the music csv file, in order.
+COLUMNS = ['music_file', 'track_name', 'track_artist', 'track_albumartist',
+           'track_composer', 'track_album', 'track_genre', 'track_duration',
+           'track_year', 'track_filesize']
+
+# Columns which are indexed in the catalog.
+INDEXED = ['track_artist', 'track_album', 'track_genre', 'track_year',
+           'track_composer']
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS tracks (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime INTEGER NOT NULL,
+    {', '.join(f'{column} TEXT' for column in COLUMNS)}
+)
+"""
+
+_catalogs = {}
+
+
+class Catalog:
+    """SQLite backed track catalog.
+
+    index: Path of the catalog database.
+           Default: `./database/library.db`
+
+    Stores every music file as a row with it`s path, fingerprint, i.e.
+    size & modification time, and the metadata in the order of
+    `COLUMNS`.
+
+    Note: The connection is shared across threads & hence every
+    operation is done under a lock.
+    """
+
+    def __init__(self, index: Text = files['library']) -> None:
+        make_dir(Path(index).parent)
+        self.index = str(index)
+        self._lock = RLock()
+        self._writes = 0
+        self._connection = sqlite3.connect(self.index,
+                                           check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        with self._lock, self._connection as connection:
+            connection.execute(_SCHEMA)
+            for column in INDEXED:
+                connection.execute(f'CREATE INDEX IF NOT EXISTS '
+                                   f'idx_tracks_{column} ON tracks '
+                                   f'({column} COLLATE NOCASE)')
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                'SELECT COUNT(*) FROM tracks').fetchone()[0]
+
+    @property
+    def revision(self) -> Tuple[int, int]:
+        """Returns revision of the catalog.
+
+        Revision changes whenever the catalog is changed, either by this
+        connection or by any other connection to the same database.
+        """
+        with self._lock:
+            version = self._connection.execute(
+                'PRAGMA data_version').fetchone()[0]
+            return self._writes, version
+
+    def fingerprints(self,
+                     paths: Optional[Iterable[Text]] = None
+                     ) -> Dict[Text, Tuple[int, int]]:
+        """Returns size & modification time of the indexed paths.
+
+        paths: Paths whose fingerprints are needed. If None, every
+               indexed path is returned.
+               Default: None
+        """
+        query = 'SELECT path, size, mtime FROM tracks'
+        with self._lock:
+            if paths is None:
+                return {row[0]: (row[1], row[2]) for row in
+                        self._connection.execute(query)}
+            paths, known = list(paths), {}
+            # Paths are looked up in batches as SQLite limits the number
+            # of parameters of a query.
+            for idx in range(0, len(paths), 500):
+                batch = paths[idx:idx + 500]
+                known.update((row[0], (row[1], row[2])) for row in
+                             self._connection.execute(
+                                 f'{query} WHERE path IN '
+                                 f'({", ".join("?" * len(batch))})', batch))
+            return known
+
+    def store(self, rows: Iterable[Tuple]) -> None:
+        """Stores rows, replacing the rows with same path.
+
+        rows: Rows with path, size & modification time followed by the
+              values of `COLUMNS`.
+        """
+        insert = f'INSERT OR REPLACE INTO tracks VALUES ' \
+                 f'({", ".join("?" * (len(COLUMNS) + 3))})'
+        with self._lock, self._connection as connection:
+            # Revision is changed only if any row is written, hence the
+            # search index is not rebuilt for nothing.
+            if connection.executemany(insert, rows).rowcount > 0:
+                self._writes += 1
+
+    def remove(self, paths: Iterable[Text]) -> None:
+        """Removes rows of the given paths."""
+        with self._lock, self._connection as connection:
+            cursor = connection.executemany(
+                'DELETE FROM tracks WHERE path = ?',
+                ((path,) for path in paths))
+            if cursor.rowcount > 0:
+                self._writes += 1
+
+    def values(self, column: Text) -> List[Text]:
+        """Returns distinct values of the column, excluding NULLs."""
+        _check(column)
+        with self._lock:
+            return [row[0] for row in self._connection.execute(
+                f'SELECT DISTINCT {column} FROM tracks '
+                f'WHERE {column} IS NOT NULL')]
+
+    def find(self, **constraints: Optional[Text]) -> List[sqlite3.Row]:
+        """Returns tracks matching all the constraints.
+
+        constraints: Column names & values which the tracks should match.
+                     The values are compared case insensitively. None
+                     values are ignored.
+
+        Returns all the tracks if no constraint is given. The tracks are
+        returned ordered by their path.
+        """
+        query, params = compile_filter(constraints, columns='*')
+        with self._lock:
+            return self._connection.execute(query, params).fetchall()
+
+    def filter(self,
+               **constraints: Optional[Text]) -> List[Tuple[int, Text,
+                                                           Text, Text]]:
+        """Returns matching track ids along with their neighbours.
+
+        constraints: Column names & values which the tracks should match.
+                     The values are compared case insensitively. None
+                     values are ignored.
+
+        Returns row id, path, previous path & next path of every matching
+        track ordered by path. The neighbours wrap around the ends.
+
+        Note: All the constraints are evaluated in a single query, hence
+        the catalog is scanned at most once per request.
+        """
+        query, params = compile_filter(constraints)
+        with self._lock:
+            rows = [tuple(row) for row in
+                    self._connection.execute(query, params)]
+        if rows:
+            # Neighbours of the first & last tracks wrap around.
+            rows[0] = rows[0][:2] + (rows[-1][1],) + rows[0][3:]
+            rows[-1] = rows[-1][:3] + (rows[0][1],)
+        return rows
+
+    def rows(self) -> Iterator[Tuple]:
+        """Yields values of `COLUMNS` for every track ordered by path."""
+        with self._lock:
+            cursor = self._connection.execute(
+                f'SELECT {", ".join(COLUMNS)} FROM tracks ORDER BY path')
+        # Lock is held only while fetching, so that the other threads
+        # are not blocked by a slow consumer.
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(1000)
+            if not rows:
+                break
+            for row in rows:
+                yield tuple(row)
+
+    def close(self) -> None:
+        """Closes the catalog."""
+        with self._lock:
+            self._connection.close()
+        _catalogs.pop(self.index, None)
+
+
+def _check(column: Text) -> None:
+    """Raises ValueError if column is not part of the catalog."""
+    if column not in COLUMNS:
+        raise ValueError(f'"{column}" is not a valid catalog column.')
+
+
+@lru_cache(maxsize=None)
+def _compile(names: Tuple[Text, ...], columns: Text) -> Text:
+    """Returns SQL query filtering on the given column names."""
+    for column in names:
+        _check(column)
+    where = ' AND '.join(f'{column} = ? COLLATE NOCASE' for column in names)
+    where = f'WHERE {where}' if where else ''
+    if columns == '*':
+        return f'SELECT * FROM tracks {where} ORDER BY path'
+    return f'SELECT rowid, path, LAG(path) OVER (ORDER BY path), ' \
+           f'LEAD(path) OVER (ORDER BY path) FROM tracks {where} ' \
+           f'ORDER BY path'
+
+
+def compile_filter(constraints: Dict[Text, Optional[Text]],
+                   columns: Optional[Text] = None) -> Tuple[Text, Tuple]:
+    """Compiles constraints into a single SQL query.
+
+    constraints: Column names & values which the tracks should match.
+    columns:     If `*`, the query selects entire rows, else it selects
+                 row id, path, previous path & next path of the tracks.
+                 Default: None
+
+    Compiles the non-null constraints into a single SQL query. Returns
+    the query along with it`s parameters. Queries are compiled once for
+    every set of column names & are reused after that.
+
+    Note: Columns are validated against the `COLUMNS` while compiling,
+    hence only the values are passed as parameters.
+    """
+    given = {column: value for column, value in constraints.items()
+             if value is not None}
+    query = _compile(tuple(sorted(given)), columns or '')
+    return query, tuple(given[column] for column in sorted(given))
+
+
+def open_catalog(index: Text = files['library']) -> Catalog:
+    """Returns opened catalog.
+
+    index: Path of the catalog database.
+           Default: `./database/library.db`
+
+    Returns the catalog opened for the given path. The catalog is opened
+    once & is reused by every subsequent call.
+    """
+    if str(index) not in _catalogs:
+        _catalogs[str(index)] = Catalog(index)
+    return _catalogs[str(index)]
+
+
+def export_csv(csv_file: Text = files['music'],
+               index: Text = files['library']) -> int:
+    """Exports the catalog to music csv file.
+
+    csv_file: Path of the music csv file.
+              Default: `./data/knowledge/csv/music.csv`
+    index:    Path of the catalog database.
+              Default: `./database/library.db`
+
+    Streams the catalog to the music csv file with `COLUMNS` as it`s
+    header. Returns the number of exported tracks.
+
+    Note: Rows are fetched in chunks & written using a buffered writer,
+    hence the memory use stays flat irrespective of size of the library.
+    The previous file stays readable till the new one replaces it.
+    """
+    from csv import writer
+
+    count = 0
+    with atomic_write(csv_file, newline='', encoding=ENCODING,
+                      buffering=1 << 16) as file:
+        csv_writer = writer(file)
+        csv_writer.writerow(COLUMNS)
+        for row in open_catalog(index).rows():
+            csv_writer.writerow(row)
+            count += 1
+    return count
+
+
+def import_csv(csv_file: Text = files['music'],
+               index: Text = files['library'],
+               file_dir: Text = local['music']) -> int:
+    """Imports music csv file into the catalog.
+
+    csv_file: Path of the music csv file with `COLUMNS` as it`s header.
+              Default: `./data/knowledge/csv/music.csv`
+    index:    Path of the catalog database.
+              Default: `./database/library.db`
+    file_dir: Directory which contains music files.
+              Default: `~/Music/` directory.
+
+    Imports the music csv file with the existing header layout into the
+    catalog. Returns the number of imported tracks.
+
+    Note: The csv file does not store the size & modification time of
+    the files, hence the imported tracks are read again on the next run
+    of `index_music`.
+    """
+    from csv import DictReader
+    from os.path import join
+
+    catalog = open_catalog(index)
+    with open(csv_file, newline='', encoding=ENCODING) as file:
+        rows = [(join(file_dir, row['music_file']), 0, 0) +
+                tuple(row.get(column) or None for column in COLUMNS)
+                for row in DictReader(file) if row.get('music_file')]
+    catalog.store(rows)
+    return len(rows)
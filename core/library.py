@@ -0,0 +1,222 @@
+"""
+The library module: Provides functions for indexing the music library.
+
+These functions help with building & maintaining an index of the music
+files along with their metadata. Every indexed file is fingerprinted
+using it`s path, size & modification time so that only the new or the
+changed files are read again on the next run. The index is stored in
+the track catalog, see the catalog module.
+
+At a glance, the structure of the module is following:
+ - extract_metadata():  Extracts the metadata of the music file. This
+                        function is used by the worker processes while
+                        indexing the music directory.
+ - cached_metadata():   Returns the metadata of the music file from the
+                        cache. The cache is keyed by the path, size &
+                        modification time of the file, hence the tags
+                        are parsed again only if the file changes.
+ - read_tags():         Returns the catalog row of the fingerprinted file.
+                        Files whose tags cannot be read are still
+                        returned with their file name.
+ - scan_music():        Yields fingerprints of all the music files in
+                        the directory.
+ - index_music():       Indexes the music directory. It reads the tags
+                        of new & changed files on a process pool, drops
+                        the deleted files from the catalog and commits the
+                        rows to the catalog in batches. Once indexed, the
+                        rows are exported to the music csv file.
+
+See https://github.com/xames3/charlotte for cloning the repository.
+"""
+#   History:
+#
+#   < Checkout my GitHub repo for history and latest stable build >
+#
+#   2.1.0 - First code.
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from os import stat, walk
+from os.path import basename, join
+from typing import Dict, Iterator, List, Optional, Text, Tuple
+
+from hurry.filesize import alternative, size
+from tinytag import TinyTag
+
+from charlotte.core.catalog import COLUMNS, export_csv, open_catalog
+from charlotte.utils.cache import LRUCache
+from charlotte.utils.generic import show
+from charlotte.utils.paths import files, local
+
+_tags = None
+
+
+def extract_metadata(file: Text) -> Tuple:
+    """Extracts music metadata.
+
+    file: Music file whose metadata needs to be extracted.
+
+    Extracts the metadata of the music file. Returns the music file name
+    followed by the rest of the metadata in the same order as the
+    `COLUMNS`.
+
+    Note: The function raises an exception if the file does not exist or
+    it`s tags cannot be read.
+    """
+    track = TinyTag.get(file)
+    duration = str(timedelta(seconds=round(track.duration))) \
+        if track.duration else None
+    filesize = size(track.filesize, system=alternative) \
+        if track.filesize else None
+    return (basename(file), track.title, track.artist, track.albumartist,
+            track.composer, track.album, track.genre, duration,
+            str(track.year) if track.year else None, filesize)
+
+
+def cached_metadata(file: Text) -> Tuple:
+    """Returns cached music metadata.
+
+    file: Music file whose metadata is needed.
+
+    Returns the metadata of the music file from the cache, the same as
+    `extract_metadata`. The cache is keyed by the path, size &
+    modification time of the file, hence the tags are parsed again only
+    if the file changes.
+
+    Note: Recently used entries are kept in the memory & up to 65536
+    entries are backed by `./cache/tags.db` file, hence the versions of
+    the files which are no longer read are eventually dropped.
+    """
+    global _tags
+    if _tags is None:
+        _tags = LRUCache(maxsize=4096, file=files['tags'], disksize=65536)
+    info = stat(file)
+    key = (str(file), info.st_size, info.st_mtime_ns)
+    metadata = _tags.get(key)
+    if metadata is None:
+        metadata = extract_metadata(file)
+        _tags.set(key, metadata)
+    return metadata
+
+
+def read_tags(entry: Tuple[Text, int, int]) -> Tuple:
+    """Returns catalog row for the fingerprinted file.
+
+    entry: Path, size & modification time of the file.
+
+    Returns the row along with True if it`s tags were read. Runs inside
+    the worker processes while indexing. Files whose tags cannot be read
+    are still indexed with their file name so that they are not read
+    again on every run.
+    """
+    path, file_size, mtime = entry
+    try:
+        return (path, file_size, mtime) + extract_metadata(path), True
+    except Exception:
+        row = (basename(path),) + (None,) * (len(COLUMNS) - 1)
+        return (path, file_size, mtime) + row, False
+
+
+def scan_music(file_dir: Text) -> Iterator[Tuple[Text, int, int]]:
+    """Yields fingerprints of all the music files.
+
+    file_dir: Directory which contains music files.
+
+    Yields path, size & modification time of every music file in the
+    directory & it`s sub-directories.
+    """
+    for root, _, names in walk(file_dir):
+        for name in names:
+            path = join(root, name)
+            if not TinyTag.is_supported(path):
+                continue
+            try:
+                info = stat(path)
+            except OSError:
+                continue
+            yield path, info.st_size, info.st_mtime_ns
+
+
+def _batches(rows: Iterator, batch_size: int) -> Iterator[List]:
+    """Groups rows into lists of `batch_size`."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def index_music(file_dir: Text = local['music'],
+                index: Text = files['library'],
+                csv_file: Optional[Text] = files['music'],
+                workers: Optional[int] = None,
+                batch_size: int = 500) -> Dict:
+    """Indexes music directory.
+
+    file_dir:   Directory which contains music files.
+                Default: `~/Music/` directory.
+    index:      Path of the catalog database.
+                Default: `./database/library.db`
+    csv_file:   Path of the csv file to which the index is exported. If
+                None, the export is skipped.
+                Default: `./data/knowledge/csv/music.csv`
+    workers:    Number of worker processes used for reading the tags.
+                Default: None (Number of processors on the machine)
+    batch_size: Number of rows committed to the index at once.
+                Default: 500
+
+    Indexes the music directory. Every file is fingerprinted using it`s
+    path, size & modification time. Unchanged files are skipped, new or
+    changed files are read on a process pool & deleted files are dropped
+    from the catalog. Returns the counts along with the indexing speed.
+
+    Note: Rows are committed in batches, hence an interrupted run keeps
+    everything indexed before the last commit.
+    """
+    from time import perf_counter
+
+    start = perf_counter()
+    catalog = open_catalog(index)
+    known = catalog.fingerprints()
+    pending, seen = [], set()
+    for path, file_size, mtime in scan_music(file_dir):
+        seen.add(path)
+        if known.get(path) != (file_size, mtime):
+            pending.append((path, file_size, mtime))
+    removed = known.keys() - seen
+    catalog.remove(removed)
+    # Reading tags is the slowest part, so it is spread across the
+    # worker processes. Handful of updates are read in this process as
+    # spawning the pool would cost more than reading them.
+    failed = 0
+    if workers == 1 or len(pending) < 64:
+        results = map(read_tags, pending)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(read_tags, pending, chunksize=64)
+    try:
+        for batch in _batches(results, batch_size):
+            catalog.store(row for row, _ in batch)
+            failed += sum(1 for _, ok in batch if not ok)
+    finally:
+        if executor:
+            executor.shutdown()
+    if csv_file:
+        export_csv(csv_file, index)
+    elapsed = perf_counter() - start
+    stats = {'files': len(seen),
+             'skipped': len(seen) - len(pending),
+             'updated': len(pending),
+             'removed': len(removed),
+             'failed': failed,
+             'seconds': round(elapsed, 2),
+             'rate': round(len(seen) / elapsed, 1) if elapsed else 0.0}
+    show(f'Indexed {stats["files"]} files in {stats["seconds"]} secs '
+         f'({stats["rate"]} files/sec). {stats["skipped"]} skipped, '
+         f'{stats["updated"]} updated, {stats["removed"]} removed & '
+         f'{stats["failed"]} failed.')
+    return stats
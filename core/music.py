@@ -12,15 +12,18 @@ At a glance, the structure of the module is following:
                         Grakn.AI. Once the use of Grakn is started, this
                         function will most likely be deprecated. The CSV is
                         stored under the `./data/knowledge/csv/` directory.
+                        Only new or changed files are read again, see
+                        `index_music` in the library module.
  - play_music_using_metadata(): Similar to `_play_music` function but instead
                         of playing music from given music file, it plays using
-                        the metadata references from the csv file. The use of
-                        csv file for pulling information will soon get
-                        deprecated and will be replaced with Grakn.AI.
+                        the metadata references from the track catalog. The
+                        catalog is opened once & queried using it`s indexes.
  - reply_on_playing():  Returns a response of the played track name.
                         This response is displayed during the inference.
  - play_next_track():   Plays next track in queue. This makes sure there is
                         always something to play if next track is requested.
+                        The queue wraps around & keeps it`s state between
+                        the requests, see the playlist module.
  - play_previous_track(): Plays previous track.
 
 See https://github.com/xames3/charlotte for cloning the repository.
@@ -29,6 +32,27 @@ See https://github.com/xames3/charlotte for cloning the repository.
 #
 #   < Checkout my GitHub repo for history and latest stable build >
 #
+#   2.1.0 - `migrate_music` now uses the incremental, parallel indexer
+#           from the library module instead of re-reading every file.
+#           `_extract_metadata` now uses `extract_metadata` from the
+#           library module.
+#           Paths are now imported from the paths module.
+#           `play_music_using_metadata` now queries the track catalog
+#           instead of reading the csv file on every request.
+#           `play_music_using_metadata` now matches the metadata using
+#           the prebuilt search index instead of scoring every value.
+#           Previous & next tracks are now played from the play queue
+#           which wraps around instead of raising IndexError.
+#           Metadata filters are now compiled into a single query.
+#           Catalog is now kept live by the watcher of music directory.
+#           `_extract_metadata` now uses the metadata cache.
+#           `reply_on_playing` now renders only the selected reply from
+#           the `music` templates of the phrases module.
+#           `find_file` & `minimize_window` are now imported from the
+#           system module, which matches using the matcher module.
+#           `_play_music` now picks & finds the files using the cached
+#           snapshot of the music directory.
+#           Player window is now minimized in background.
 #   1.0.2 - Fixed error caused when `os.walk` was not imported in
 #           `play_music_using_metadata` function.
 #           Added ignored support for previous and next track in
@@ -41,14 +65,14 @@ See https://github.com/xames3/charlotte for cloning the repository.
 from inspect import stack
 from sys import exc_info
 
-from charlotte.utils.assists.generic import find_file, str_match, write_to_csv
-from charlotte.utils.assists.profile import lower, title
-from charlotte.utils.assists.system import minimize_window
-from charlotte.utils.paths.directories import local_dir
-from charlotte.utils.paths.files import ai_file
-
-# Constant used by `play_music_using_metadata` to use default UTF-8 encoding.
-_ENCODING = 'utf-8'
+from charlotte.core.catalog import Catalog, open_catalog
+from charlotte.core.library import cached_metadata, index_music
+from charlotte.core.playlist import PlayQueue, play_queue
+from charlotte.core.search import search_index
+from charlotte.core.watcher import watch_library
+from charlotte.utils.paths import local
+from charlotte.utils.phrases import replies
+from charlotte.utils.system import find_file, minimize_window, snapshot
 
 
 def _extract_metadata(file: str) -> tuple:
@@ -60,39 +84,25 @@ def _extract_metadata(file: str) -> tuple:
     provide necessary information and is recommended to use in conjunction
     with function `play_music_using_metadata`.
     """
-    from os.path import basename, isfile
-    from datetime import timedelta
-    from hurry.filesize import size, alternative
-    from tinytag import TinyTag
+    from os.path import isfile
 
     try:
         # Execute code if file exists.
         if isfile(file):
-            music_track = TinyTag.get(file)
-            music_file = basename(file)
-            track_name = music_track.title
-            track_artist = music_track.artist
-            track_albumartist = music_track.albumartist
-            track_composer = music_track.composer
-            track_album = music_track.album
-            track_genre = music_track.genre
-            track_duration = str(
-                timedelta(seconds=round(music_track.duration)))
-            track_year = music_track.year
-            track_filesize = size(music_track.filesize, system=alternative)
             # Returns all the extracted metadata along with music filename.
-            return music_file, track_name, track_artist, track_albumartist, track_composer, track_album, track_genre, track_duration, track_year, track_filesize
+            # Tags are parsed only once per version of the file.
+            return cached_metadata(file)
         else:
-            return f'Sorry {lower}. I could not find any track with the search parameters.'
+            return replies.render('music.missing')
     except Exception as error:
         exception(error)
 
 
-def migrate_music(file_dir: str = local_dir['music']) -> None:
+def migrate_music(file_dir: str = local['music']) -> None:
     """Creates csv of music files.
 
     file_dir: Directory which contains music files.
-              Default: `D:/Music/` directory.
+              Default: `~/Music/` directory.
 
     Creates a csv file of the Music files and it`s related metadata. This
     process is a stepping stone for creating a pre-dataset before moving on
@@ -115,69 +125,68 @@ def migrate_music(file_dir: str = local_dir['music']) -> None:
     likely be deprecated. The CSV is stored under the `./data/knowledge/csv/`
     directory.
     """
-    from os import remove, walk
-    from os.path import isfile, join
-
     try:
-        # List of all headers in the csv file.
-        header_list = ['music_file', 'track_name', 'track_artist',
-                       'track_albumartist', 'track_composer', 'track_album',
-                       'track_genre', 'track_duration', 'track_year',
-                       'track_filesize']
-        # Deletes if the previous csv file exists.
-        # This is to avoid data duplication.
-        if isfile(ai_file['music']):
-            remove(ai_file['music'])
-        for _, _, files in walk(file_dir):
-            for file in files:
-                # Extracting metadata information from the music files and
-                music_file, track_name, track_artist, track_albumartist, track_composer, track_album, track_genre, track_duration, track_year, track_filesize = _extract_metadata(
-                    join(local_dir['music'], file))
-                # Writing it in csv file.
-                write_to_csv(ai_file['music'], music_file, track_name,
-                             track_artist, track_albumartist, track_composer,
-                             track_album, track_genre, track_duration,
-                             track_year, track_filesize)
+        # Only new or changed files are read again, the rest of the rows
+        # are reused from the index before exporting them to csv file.
+        return index_music(file_dir)
     except Exception as error:
         exception(error)
 
 
-def _play_music(file: str = None, file_dir: str = local_dir['music']) -> None:
+def _open_catalog() -> Catalog:
+    """Returns the track catalog.
+
+    The catalog is kept in sync with the music directory by the watcher,
+    hence the lookups never need to walk the music directory.
+    """
+    from os.path import isdir
+
+    catalog = open_catalog()
+    if isdir(local['music']):
+        watch_library()
+    return catalog
+
+
+def _play_music(file: str = None, file_dir: str = local['music']) -> None:
     """Plays music.
 
     file:     Fuzzy name of the music file that needs to be played.
               Default: None
     file_dir: Directory which has music files.
               Here, it`s under Music directory.
-              Default: D:/Music/
+              Default: ~/Music/
 
-    Plays music from default music directory, `D:/Music/`.
+    Plays music from default music directory, `~/Music/`.
 
     Note: If no music selection/file is provided, the function will start
     playing music automatically at random from the default music directory.
     """
-    from os import startfile, listdir
+    from os import startfile
     from os.path import isfile, join
-    from random import choice
 
     try:
         # If music file name is provided then play that music file, else play
         # any random music file from the default music directory.
-        if file:
+        if file and isfile(file):
+            # Queued tracks are already resolved to their path.
+            music_file = file
+        elif file:
             # This returns a tuple with file name and it`s score.
-            # For more information on the function, refer generic.py module.
+            # For more information on the function, refer system.py module.
             file_name, file_score = find_file(file, file_dir)
             if file_score == 0:
                 return file_name
             else:
                 music_file = join(file_dir, file_name)
         else:
-            # Randomly chooses file from the default music directory.
-            music_file = choice([join(local_dir['music'], file) for file in listdir(
-                local_dir['music']) if isfile(join(local_dir['music'], file))])
+            # Randomly chooses file from the default music directory. The
+            # directory is listed again only if it has changed.
+            music_file = snapshot(local['music']).random()
         # Plays the music file.
         startfile(music_file)
-        minimize_window('Groove Music')
+        # Player is minimized in background, hence the reply is not held
+        # up if the player window does not appear.
+        minimize_window('Groove Music', background=True)
         return _extract_metadata(music_file)
     except Exception as error:
         exception(error)
@@ -195,7 +204,7 @@ def play_music_using_metadata(music_file: str = None,
                               track_filesize: str = None) -> None:
     """Plays music using references.
 
-    music_file:        Name of the music file you need to search in csv file.
+    music_file:        Name of the music file you need to search in catalog.
     track_name:        Name of the track.
     track_artist:      Name of the artist.
     track_albumartist: Name of the artist/s which featured in the track.
@@ -207,93 +216,87 @@ def play_music_using_metadata(music_file: str = None,
     track_filesize:    Music file size (in MBs).
 
     Similar to `_play_music` function but instead of playing music from given
-    music file, it plays using the metadata references from the csv file.
+    music file, it plays using the metadata references from the track catalog.
 
-    Note: The use of csv file for pulling information will soon get deprecated
-    and will be replaced with Grakn.AI.
+    Note: The catalog is opened once and every request is an indexed lookup.
+    Run `migrate_music` or `import_csv` from the catalog module to fill it.
 
     Caution: All values are None by default. This will ensure, no value is
     passed to the `_play_music` function inside it. No input to `_play_music`
     will play file randomly.
     """
-    from os import walk
-    from random import randint
-    from numpy import ones
-    from pandas import read_csv, Series
+    from random import choice
 
     try:
-        # Generating a list of all the tracks inside the directory.
-        for _, _, track_list in walk(local_dir['music']):
-            pass
-        # If music file is given, find it`s relative previous and next track.
-        if music_file:
-            # This generated track list is used for finding the relative next
-            # and previous tracks.
-            previous_track = track_list[track_list.index(
-                str_match(music_file, track_list)) - 1]
-            next_track = track_list[track_list.index(
-                str_match(music_file, track_list)) + 1]
-            playing_file = _play_music(music_file)
-            return playing_file, previous_track, next_track
-        elif track_name:
-            # Added support for previous and next track since the inputs come
-            # from a Slot, track_name.
-            previous_track = track_list[track_list.index(
-                str_match(track_name, track_list)) - 1]
-            next_track = track_list[track_list.index(
-                str_match(track_name, track_list)) + 1]
-            playing_file = _play_music(track_name)
-            return playing_file, previous_track, next_track
+        catalog = _open_catalog()
+        queue = play_queue()
+        # If music file or track name is given, find it in the catalog and
+        # play it from the queue along with it`s relative previous and next
+        # track.
+        if music_file or track_name:
+            column, value = ('music_file', music_file) if music_file else \
+                ('track_name', track_name)
+            match = search_index(catalog).match(column, value)
+            rows = catalog.find(**{column: match}) if match else []
+            if not rows:
+                return replies.render('music.missing')
+            # The queue is loaded with the whole catalog only if the track is
+            # not already queued, hence nothing is rescanned on next request.
+            if rows[0]['path'] not in queue:
+                queue.load(row['path'] for row in catalog.find())
+            queue.seek(rows[0]['path'])
+            return _play_queued(queue)
         else:
-            music_csv_file = ai_file['music']
-            # Calling csv object for lookup.
-            df = read_csv(music_csv_file, encoding=_ENCODING)
-            # Creating a master dictionary which has all the filtering
-            # parameters from the given arguments, including None values.
-            master_dict = {
-                'track_name': str_match(track_name, df['track_name'].dropna().tolist()),
-                'track_artist': str_match(track_artist, df['track_artist'].dropna().tolist()),
-                'track_albumartist': str_match(track_albumartist, df['track_albumartist'].dropna().tolist()),
-                'track_composer': str_match(track_composer, df['track_composer'].dropna().tolist()),
-                'track_album': str_match(track_album, df['track_album'].dropna().tolist()),
-                'track_genre': str_match(track_genre, df['track_genre'].dropna().tolist()),
-                'track_duration': str_match(track_duration, df['track_duration'].dropna().tolist()),
-                'track_year': str_match(track_year, df['track_year'].dropna().tolist()),
-                'track_filesize': str_match(track_filesize, df['track_filesize'].dropna().tolist())}
-            # Creating a filtered dictionary with only non-None key-value pair.
-            filtered_dict = {k: v for k,
-                             v in master_dict.items() if v is not None}
-            # Not sure what it does, referred from the internet.
-            # Link to the reference code is to be posted here.
-            filter_series = Series(ones(df.shape[0], dtype=bool))
-            for column, value in filtered_dict.items():
-                filter_series = ((df[column] == value) & filter_series)
+            given = {'track_name': track_name,
+                     'track_artist': track_artist,
+                     'track_albumartist': track_albumartist,
+                     'track_composer': track_composer,
+                     'track_album': track_album,
+                     'track_genre': track_genre,
+                     'track_duration': track_duration,
+                     'track_year': track_year,
+                     'track_filesize': track_filesize}
+            # Creating a filtered dictionary with only non-None values which
+            # are fuzzy matched using the prebuilt search index.
+            index = search_index(catalog)
+            filtered_dict = {column: index.match(column, value)
+                             for column, value in given.items()
+                             if value is not None}
             # Generating track list which is used for finding the relative next
-            # and previous tracks from the filtered dictionary.
-            track_list = df[filter_series]['music_file'].tolist()
-            if len(df[filter_series]) > 1:
+            # and previous tracks from the filtered dictionary. All filters are
+            # compiled into a single query which is evaluated only once. If
+            # any given value has no match, no track can satisfy the filters.
+            if None in filtered_dict.values():
+                track_list = []
+            else:
+                track_list = [path for _, path, _, _ in
+                              catalog.filter(**filtered_dict)]
+            if track_list:
                 # If more than one track is returned after applying all the
-                # filters, it picks music file at random along with returning
-                # previous and next tracks.
-                random_pick = df[filter_series].iloc[randint(
-                    0, len(df[filter_series])), 0]
-                previous_track = track_list[track_list.index(random_pick) - 1]
-                next_track = track_list[track_list.index(random_pick) + 1]
-                playing_file = _play_music(random_pick)
-                return playing_file, previous_track, next_track
-            elif len(df[filter_series]) == 1:
-                # If only one value is received after applying all filters.
-                current_pick = df[filter_series].iloc[0, 0]
-                previous_track = track_list[track_list.index(current_pick) - 1]
-                next_track = track_list[track_list.index(current_pick) + 1]
-                playing_file = _play_music(current_pick)
-                return playing_file, previous_track, next_track
+                # filters, it picks music file at random and queues the rest
+                # of the tracks around it.
+                queue.load(track_list, current=choice(track_list))
+                return _play_queued(queue)
             else:
-                return f'Sorry {lower}. I could not find any track with the search parameters.'
+                return replies.render('music.missing')
     except Exception as error:
         exception(error)
 
 
+def _play_queued(queue: PlayQueue) -> tuple:
+    """Plays current track of the queue.
+
+    queue: Play queue whose current track needs to be played.
+
+    Returns the playing file along with the previous and next track names.
+    """
+    from os.path import basename
+
+    previous_track, next_track = queue.neighbours()
+    playing_file = _play_music(queue.current)
+    return playing_file, basename(previous_track), basename(next_track)
+
+
 def reply_on_playing(file_name: str = None,
                      track_name: str = None,
                      track_artist: str = None) -> None:
@@ -309,50 +312,25 @@ def reply_on_playing(file_name: str = None,
     Caution: All values are None by default.
     """
     from pathlib import Path
-    from random import choice
 
     # Returns file name without extension.
     file_name = Path(file_name).stem
-    with_file_name = [f'Alright, playing {file_name}.',
-                      f'Alright {lower}, playing {file_name}.',
-                      f'Sure, playing {file_name}.',
-                      f'Okay, playing {file_name}.',
-                      f'Right on it, {lower}.',
-                      'Here you go...',
-                      'Okay...']
-    with_track_name = [f'Alright, playing {track_name}.',
-                       f'Alright {lower}, playing {track_name}.',
-                       f'Sure, playing {track_name}.',
-                       f'Okay, playing {track_name}.',
-                       f'Right on it, {lower}.',
-                       'Here you go...',
-                       'Okay...']
-    both_details = [f'Alright, playing {track_name} by {track_artist}.',
-                    f'Alright, playing {track_name}.',
-                    f'Alright {lower}, playing {track_name}.',
-                    f'Sure, playing {track_name} by {track_artist}.',
-                    f'Okay, playing {track_name} by {track_artist}.',
-                    f'Right on it, {lower}.',
-                    'Okay...']
-
-    without_file_name = [f'Sorry {lower}. I could not find any track with '
-                         'the search parameters.',
-                         f'Sorry {lower}. I could not find any match for'
-                         ' the playing track.']
     try:
         # If no track is detected after passing multiple parameters and random
-        # is not played, it returns below choice.
+        # is not played, it returns below reply.
         if len(file_name) == 1 and file_name == 'S':
-            return choice(without_file_name)
+            return replies.render('music.missing')
         else:
-            # If valid details are provided, it returns respective choice.
+            # If valid details are provided, it returns respective reply. Only
+            # the selected reply is rendered.
             if track_artist is None:
                 if track_name is None:
-                    return choice(with_file_name)
+                    return replies.render('music.file', file_name=file_name)
                 else:
-                    return choice(with_track_name)
+                    return replies.render('music.track', track_name=track_name)
             else:
-                return choice(both_details)
+                return replies.render('music.both', track_name=track_name,
+                                      track_artist=track_artist)
     except Exception as error:
         exception(error)
 
@@ -364,14 +342,21 @@ def play_next_track(next_track: str) -> None:
 
     Plays next track in queue. This makes sure there is always something to
     play if next track is requested.
+
+    Note: The queue wraps around, hence the first track is played after the
+    last one. The given track is searched only if nothing is queued.
     """
     try:
+        queue = play_queue()
+        # Moving the queue takes constant time, nothing is rescanned.
+        if len(queue):
+            queue.next()
+            return _play_queued(queue)
         # If no input is given, it will return no track to play response.
         if next_track is None:
-            return f'Sorry {lower}. There is no track to play.'
+            return replies.render('music.empty')
         else:
-            return play_music_using_metadata(music_file=next_track,
-                                             track_name=next_track)
+            return play_music_using_metadata(music_file=next_track)
     except Exception as error:
         exception(error)
 
@@ -385,11 +370,15 @@ def play_previous_track(previous_track: str) -> None:
     track.
     """
     try:
+        queue = play_queue()
+        # Moving the queue takes constant time, nothing is rescanned.
+        if len(queue):
+            queue.previous()
+            return _play_queued(queue)
         # If no input is given, it will return no track to play response.
         if previous_track is None:
-            return f'Sorry {lower}. There is no track to play.'
+            return replies.render('music.empty')
         else:
-            return play_music_using_metadata(music_file=previous_track,
-                                             track_name=previous_track)
+            return play_music_using_metadata(music_file=previous_track)
     except Exception as error:
         exception(error)
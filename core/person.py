@@ -18,6 +18,7 @@ See https://github.com/xames3/charlotte for cloning the repository.
 #
 #   < Checkout my GitHub repo for history and latest stable build >
 #
+#   2.1.0 - `greet_user` now renders only the greeting which is used.
 #   2.0.0 - Reworked script.
 #           Removed `age` & `locate` functions.
 #           `greet_user` now returns just the greetings.
@@ -36,7 +37,7 @@ See https://github.com/xames3/charlotte for cloning the repository.
 from typing import Text
 
 from charlotte.utils.constants import DARK, DAWN, DUSK, NOON
-from charlotte.utils.phrases import greet
+from charlotte.utils.phrases import replies
 
 
 def greet_user() -> Text:
@@ -48,16 +49,12 @@ def greet_user() -> Text:
     is returned on the basis of the current hour.
     """
     from datetime import datetime
-    from random import choice
 
     hour = datetime.now().hour
-    morning = choice(greet['morning'])
-    afternoon = choice(greet['afternoon'])
-    evening = choice(greet['evening'])
-    night = choice(greet['night'])
     # Determining which greeting should be used.
-    greeting = morning if hour >= DAWN and hour < NOON else \
-        afternoon if hour >= NOON and hour < DUSK else \
-        evening if hour >= DUSK and hour < DARK else night
-    # Returns greetings as per the day & current time-hour-minutes.
-    return greeting
+    part = 'morning' if hour >= DAWN and hour < NOON else \
+        'afternoon' if hour >= NOON and hour < DUSK else \
+        'evening' if hour >= DUSK and hour < DARK else 'night'
+    # Returns greetings as per the day & current time-hour-minutes. Only
+    # the greeting which is used is rendered.
+    return replies.render(f'greet.{part}')
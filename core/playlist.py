@@ -0,0 +1,153 @@
+"""
+The playlist module: Provides the play queue for the music tracks.
+
+The play queue holds the current play order of the tracks. It is backed
+by a list along with a lookup of each track`s position, hence moving to
+the next or previous track, or jumping to any track takes constant
+time.
+
+At a glance, the structure of the module is following:
+ - PlayQueue():         Array backed play queue with wraparound and
+                        shuffle mode. The queue keeps it`s state between
+                        the requests, hence next or previous tracks are
+                        played without scanning the music directory.
+ - play_queue():        Returns the play queue shared by the music
+                        module & the actions.
+
+See https://github.com/xames3/charlotte for cloning the repository.
+"""
+#   History:
+#
+#   < Checkout my GitHub repo for history and latest stable build >
+#
+#   2.1.0 - First code.
+
+from random import Random
+from typing import Iterable, List, Optional, Text, Tuple
+
+_queue = None
+
+
+class PlayQueue:
+    """Array backed play queue.
+
+    tracks:  Tracks to be queued, in their play order.
+             Default: ()
+    shuffle: If made True, the tracks are played in random order.
+             Default: False
+    seed:    Seed for the shuffle mode.
+             Default: None
+
+    Holds the current play order of the tracks. Next and previous tracks
+    wrap around the ends of the queue.
+
+    Note: Toggling the shuffle mode re-orders the queue but keeps the
+    current track playing.
+    """
+
+    def __init__(self,
+                 tracks: Iterable[Text] = (),
+                 shuffle: bool = False,
+                 seed: Optional[int] = None) -> None:
+        self._random = Random(seed)
+        self._shuffle = shuffle
+        self._tracks: List[Text] = []
+        self._order: List[Text] = []
+        self._position = {}
+        self._current = 0
+        self.load(tracks)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, track: Text) -> bool:
+        return track in self._position
+
+    def load(self, tracks: Iterable[Text],
+             current: Optional[Text] = None) -> None:
+        """Replaces the queued tracks.
+
+        tracks:  Tracks to be queued, in their play order.
+        current: Track to start the queue from. If None, the queue starts
+                 from it`s first track.
+                 Default: None
+        """
+        self._tracks = list(dict.fromkeys(tracks))
+        self._reorder(current)
+
+    def _reorder(self, current: Optional[Text] = None) -> None:
+        """Rebuilds play order & positions keeping the current track."""
+        self._order = list(self._tracks)
+        if self._shuffle:
+            self._random.shuffle(self._order)
+        self._position = {track: idx for idx, track in enumerate(self._order)}
+        self._current = 0
+        if current is not None:
+            self.seek(current)
+
+    @property
+    def shuffle(self) -> bool:
+        """Returns True if the queue is in shuffle mode."""
+        return self._shuffle
+
+    @shuffle.setter
+    def shuffle(self, value: bool) -> None:
+        if value != self._shuffle:
+            self._shuffle = value
+            self._reorder(self.current)
+
+    @property
+    def current(self) -> Optional[Text]:
+        """Returns currently playing track, None if queue is empty."""
+        return self._order[self._current] if self._order else None
+
+    def seek(self, track: Text) -> Text:
+        """Moves the queue to the track.
+
+        Raises KeyError if the track is not queued.
+        """
+        self._current = self._position[track]
+        return track
+
+    def _step(self, offset: int) -> Optional[Text]:
+        """Returns track at the offset from current, with wraparound."""
+        if not self._order:
+            return None
+        return self._order[(self._current + offset) % len(self._order)]
+
+    def peek_next(self) -> Optional[Text]:
+        """Returns next track without moving the queue."""
+        return self._step(1)
+
+    def peek_previous(self) -> Optional[Text]:
+        """Returns previous track without moving the queue."""
+        return self._step(-1)
+
+    def neighbours(self) -> Tuple[Optional[Text], Optional[Text]]:
+        """Returns previous & next track of the current track."""
+        return self.peek_previous(), self.peek_next()
+
+    def next(self) -> Optional[Text]:
+        """Moves to the next track and returns it."""
+        if self._order:
+            self._current = (self._current + 1) % len(self._order)
+        return self.current
+
+    def previous(self) -> Optional[Text]:
+        """Moves to the previous track and returns it."""
+        if self._order:
+            self._current = (self._current - 1) % len(self._order)
+        return self.current
+
+
+def play_queue() -> PlayQueue:
+    """Returns play queue.
+
+    Returns the play queue shared by the music module & the actions. The
+    queue lives as long as the action server, hence it keeps it`s state
+    between the action calls.
+    """
+    global _queue
+    if _queue is None:
+        _queue = PlayQueue()
+    return _queue
@@ -0,0 +1,143 @@
+"""
+The search module: Provides in-memory fuzzy search over the catalog.
+
+The search index is built over the normalized values of the track
+catalog. Every value is split into trigrams so that only a short list of
+candidates is fully scored by the fuzzy matcher instead of every value
+of the column. Matching is approximate, a value sharing few trigrams
+with the query can be missed even if it scores better.
+
+At a glance, the structure of the module is following:
+ - SearchIndex():       In-memory trigram index over the catalog values.
+                        Only the candidates retrieved using the trigrams
+                        are scored, hence the matches are approximate.
+ - search_index():      Returns the search index of the catalog. The
+                        index is rebuilt only when the catalog changes.
+
+See https://github.com/xames3/charlotte for cloning the repository.
+"""
+#   History:
+#
+#   < Checkout my GitHub repo for history and latest stable build >
+#
+#   2.1.0 - First code.
+
+from collections import Counter
+from typing import Dict, List, Optional, Set, Text
+
+from rapidfuzz.utils import default_process
+
+from charlotte.core.catalog import Catalog
+from charlotte.utils.matcher import match
+
+# Columns which are indexed up front. Rest of the columns are indexed
+# when they are searched for the first time.
+FIELDS = ['track_name', 'track_artist', 'track_albumartist',
+          'track_composer', 'track_album', 'track_genre']
+
+_indexes = {}
+
+
+def _trigrams(text: Text) -> Set[Text]:
+    """Returns set of trigrams of the padded text."""
+    text = f' {text} '
+    return {text[idx:idx + 3] for idx in range(len(text) - 2)}
+
+
+class _Field:
+    """Trigram postings of a single column."""
+
+    def __init__(self, values: List[Text]) -> None:
+        self.values = values
+        self.normalized = [default_process(value) for value in values]
+        self.postings = {}
+        for idx, value in enumerate(self.normalized):
+            for gram in _trigrams(value):
+                self.postings.setdefault(gram, []).append(idx)
+
+    def candidates(self, query: Text, limit: int) -> Optional[List[int]]:
+        """Returns ids of values sharing the most trigrams with query.
+
+        Returns None if the query is too short or too common for the
+        trigrams to narrow down the values.
+        """
+        # Trigrams present in most of the values do not narrow down the
+        # candidates but cost the most while counting, hence skipped.
+        common = max(len(self.values) // 10, limit)
+        postings = [self.postings[gram] for gram in _trigrams(query)
+                    if gram in self.postings]
+        postings = [ids for ids in postings if len(ids) <= common]
+        if len(query) < 3 or not postings:
+            return None
+        counts = Counter()
+        for ids in postings:
+            counts.update(ids)
+        # Sorting by ids keeps the order of values, hence ties are broken
+        # the same way as scoring all the values.
+        return sorted(idx for idx, _ in counts.most_common(limit))
+
+
+class SearchIndex:
+    """In-memory fuzzy search index.
+
+    catalog: Catalog whose values need to be indexed.
+    limit:   Maximum number of candidates which are fully scored.
+             Default: 64
+
+    Builds trigram postings over the normalized values of the `FIELDS`.
+    While matching, only the values sharing the most trigrams with the
+    query are scored, hence the rest of the values are never touched.
+
+    Note: Matching is approximate. A value sharing few trigrams with the
+    query is not a candidate & can be missed even if it`s score is
+    better, unlike `find_string` which scores every value. All the
+    values are scored only if the query is too short or too common for
+    the trigrams to narrow them down.
+    """
+
+    def __init__(self, catalog: Catalog, limit: int = 64) -> None:
+        self.revision = catalog.revision
+        self.limit = limit
+        self._catalog = catalog
+        self._fields: Dict[Text, _Field] = {
+            column: _Field(catalog.values(column)) for column in FIELDS}
+
+    def match(self,
+              column: Text,
+              value: Text,
+              min_score: Optional[int] = 70) -> Optional[Text]:
+        """Returns the best matching value of the column.
+
+        column:    Column in which the value needs to be searched.
+        value:     Approximate value that needs to be searched.
+        min_score: Minimum score needed to make an approximate guess.
+                   Default: 70
+
+        Returns None if no candidate crosses the minimum score.
+        """
+        if column not in self._fields:
+            self._fields[column] = _Field(self._catalog.values(column))
+        field = self._fields[column]
+        query = default_process(str(value))
+        candidates = field.candidates(query, self.limit)
+        if candidates is None:
+            best = match(query, field.normalized, min_score, processor=None)
+            return field.values[best[2]] if best else None
+        best = match(query,
+                     [field.normalized[idx] for idx in candidates],
+                     min_score, processor=None)
+        return field.values[candidates[best[2]]] if best else None
+
+
+def search_index(catalog: Catalog) -> SearchIndex:
+    """Returns search index of the catalog.
+
+    catalog: Catalog whose search index is needed.
+
+    Returns the search index of the catalog. The index is rebuilt only
+    when the catalog changes.
+    """
+    index = _indexes.get(catalog.index)
+    if index is None or index.revision != catalog.revision:
+        index = _indexes[catalog.index] = SearchIndex(catalog)
+    return index
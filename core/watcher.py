@@ -0,0 +1,257 @@
+"""
+The watcher module: Keeps the track catalog in sync with the music
+directory.
+
+The watcher runs in background and applies the file system events of
+the music directory to the track catalog as they happen. Hence the
+catalog stays live between the runs of `migrate_music` and the lookups
+never need to walk the music directory.
+
+At a glance, the structure of the module is following:
+ - LibraryWatcher():    Background watcher of the music directory. It
+                        uses `watchdog` which is based on inotify on
+                        Linux & falls back to polling the directory if
+                        `watchdog` is not available or the directory can
+                        not be watched. Bursts of events are coalesced
+                        before applying them.
+ - watch_library():     Starts the watcher for the music directory. The
+                        watcher is started only once & is reused by
+                        every subsequent call.
+
+See https://github.com/xames3/charlotte for cloning the repository.
+"""
+#   History:
+#
+#   < Checkout my GitHub repo for history and latest stable build >
+#
+#   2.1.0 - First code.
+
+from os import stat
+from os.path import isdir
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Dict, Optional, Text, Union
+
+from tinytag import TinyTag
+
+from charlotte.core.catalog import open_catalog
+from charlotte.core.library import index_music, read_tags, scan_music
+from charlotte.utils.paths import files, local
+
+_watchers = {}
+
+
+class LibraryWatcher:
+    """Background watcher of the music directory.
+
+    file_dir: Directory which contains music files.
+              Default: `~/Music/` directory.
+    index:    Path of the catalog database.
+              Default: `./database/library.db`
+    delay:    Seconds with no new events after which a burst of events
+              is applied to the catalog.
+              Default: 1.0 sec.
+    interval: Seconds between the scans if the directory is polled.
+              Default: 5.0 secs.
+
+    Applies created, modified, deleted & renamed files to the catalog.
+    Events of the same file are coalesced, hence a file copied in many
+    writes is read only once.
+
+    Note: Events of the directories, like renaming an album folder,
+    trigger an incremental re-index of the music directory.
+    """
+
+    def __init__(self,
+                 file_dir: Text = local['music'],
+                 index: Text = files['library'],
+                 delay: Union[float, int] = 1.0,
+                 interval: Union[float, int] = 5.0) -> None:
+        self.file_dir = str(file_dir)
+        self.index = index
+        self.delay = delay
+        self.interval = interval
+        self._pending: Dict[Text, bool] = {}
+        self._rescan = False
+        self._last = 0.0
+        self._lock = Lock()
+        self._changed = Event()
+        self._stopped = Event()
+        self._observer = None
+        self._threads = []
+
+    @property
+    def running(self) -> bool:
+        """Returns True if the watcher is running."""
+        return bool(self._threads) and not self._stopped.is_set()
+
+    def start(self) -> 'LibraryWatcher':
+        """Starts watching the music directory."""
+        if self.running:
+            return self
+        self._stopped.clear()
+        try:
+            self._observer = self._watch()
+        except (ImportError, OSError):
+            # Polling is used if `watchdog` is not installed or the
+            # directory can not be watched, e.g. inotify limit is hit.
+            self._threads.append(Thread(target=self._poll, daemon=True))
+        self._threads.append(Thread(target=self._apply, daemon=True))
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops watching the music directory."""
+        self._stopped.set()
+        self._changed.set()
+        if self._observer:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def notify(self, path: Text, exists: bool = True) -> None:
+        """Queues a changed path.
+
+        path:   Path of the changed file or directory.
+        exists: If made False, the path is removed from the catalog.
+                Default: True
+        """
+        with self._lock:
+            if isdir(path):
+                self._rescan = True
+            else:
+                self._pending[path] = exists
+            self._last = monotonic()
+        self._changed.set()
+
+    def _watch(self) -> object:
+        """Starts `watchdog` observer which notifies the watcher."""
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        watcher = self
+
+        class _Handler(FileSystemEventHandler):
+            """Forwards file system events to the watcher."""
+
+            def on_any_event(self, event) -> None:
+                if event.is_directory and event.event_type != 'modified':
+                    with watcher._lock:
+                        watcher._rescan = True
+                        watcher._last = monotonic()
+                    watcher._changed.set()
+                elif not event.is_directory:
+                    if event.event_type == 'moved':
+                        watcher.notify(event.src_path, exists=False)
+                        watcher.notify(event.dest_path)
+                    else:
+                        watcher.notify(event.src_path,
+                                       event.event_type != 'deleted')
+
+        observer = Observer()
+        observer.daemon = True
+        try:
+            observer.schedule(_Handler(), self.file_dir, recursive=True)
+            observer.start()
+        except OSError:
+            # Watches added before the error are released.
+            observer.stop()
+            raise
+        return observer
+
+    def _poll(self) -> None:
+        """Polls the music directory & notifies the changed files."""
+        # Starting from the catalog, hence the changes made while the
+        # watcher was not running are also applied on the first scan.
+        previous = open_catalog(self.index).fingerprints()
+        while not self._stopped.wait(self.interval):
+            current = {path: (size, mtime)
+                       for path, size, mtime in scan_music(self.file_dir)}
+            for path in previous.keys() - current.keys():
+                self.notify(path, exists=False)
+            for path, fingerprint in current.items():
+                if previous.get(path) != fingerprint:
+                    self.notify(path)
+            previous = current
+
+    def _apply(self) -> None:
+        """Applies coalesced events to the catalog."""
+        while not self._stopped.is_set():
+            self._changed.wait()
+            self._changed.clear()
+            # Waits till the burst of events is over.
+            while not self._stopped.is_set():
+                with self._lock:
+                    quiet = monotonic() - self._last
+                if quiet >= self.delay:
+                    break
+                self._stopped.wait(self.delay - quiet)
+            if self._stopped.is_set():
+                break
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                rescan, self._rescan = self._rescan, False
+            try:
+                if rescan:
+                    index_music(self.file_dir, self.index, csv_file=None,
+                                workers=1)
+                else:
+                    self._update(pending)
+            except Exception as error:
+                print('An error occured while updating the catalog because '
+                      f'of {error}.')
+
+    def _update(self, pending: Dict[Text, bool]) -> None:
+        """Stores the changed files & removes the deleted files."""
+        # Files which are not music, like `cover.jpg` are never in the
+        # catalog, hence they are skipped.
+        pending = {path: exists for path, exists in pending.items()
+                   if TinyTag.is_supported(path)}
+        if not pending:
+            return
+        catalog = open_catalog(self.index)
+        known = catalog.fingerprints(pending)
+        rows, removed = [], []
+        for path, exists in pending.items():
+            if not exists:
+                removed.append(path)
+                continue
+            try:
+                info = stat(path)
+            except OSError:
+                removed.append(path)
+                continue
+            fingerprint = (info.st_size, info.st_mtime_ns)
+            if known.get(path) != fingerprint:
+                rows.append(read_tags((path,) + fingerprint)[0])
+        removed = [path for path in removed if path in known]
+        if removed:
+            catalog.remove(removed)
+        if rows:
+            catalog.store(rows)
+
+
+def watch_library(file_dir: Text = local['music'],
+                  index: Text = files['library'],
+                  delay: Optional[Union[float, int]] = 1.0) -> LibraryWatcher:
+    """Starts the watcher.
+
+    file_dir: Directory which contains music files.
+              Default: `~/Music/` directory.
+    index:    Path of the catalog database.
+              Default: `./database/library.db`
+    delay:    Seconds with no new events after which a burst of events
+              is applied to the catalog.
+              Default: 1.0 sec.
+
+    Starts the watcher for the music directory. The watcher is started
+    only once & is reused by every subsequent call.
+    """
+    key = (str(file_dir), str(index))
+    if key not in _watchers:
+        _watchers[key] = LibraryWatcher(file_dir, index, delay)
+    return _watchers[key].start()
@@ -5,6 +5,16 @@ These module lets you to perform weather forecast related queries with
 relative ease.
 
 At a glance, the structure of the module is following:
+ - ForecastCache():     In-memory cache of the forecast responses keyed
+                        by the grid cell & units. Each block of the
+                        response expires as per it`s own freshness and
+                        stale responses are served while they refresh
+                        in background.
+ - forecast_cache_stats(): Returns hit & miss counters of the forecast
+                        cache, i.e. hits, stale hits, misses & size.
+ - normalize_condition(): Returns condition summary suitable for the
+                        replies. Summaries are rewritten in a single
+                        pass using `CONDITION_RULES` & are memoized.
  - forecast():          Returns the weather forecast. This is done using
                         API call made to `DarkSky.net`. It can return
                         current weather and/or forecast on basis of days
@@ -12,6 +22,17 @@ At a glance, the structure of the module is following:
                         is required to get the api key. API call is made
                         to retreive the weather report. Only 1000 calls
                         be made per month on the free tier.
+ - forecast_async():    Returns the same weather as `forecast` without
+                        blocking the event loop. Independent network
+                        calls are made concurrently, hence it is
+                        recommended for the action server.
+ - weather_async():     Returns the weather of `forecast_async` along
+                        with the place & the condition. Errors are
+                        raised instead of being printed.
+ - forecast_many():     Returns the weather of many locations as soon as
+                        each of them is ready. Locations in the same
+                        grid cell share a single forecast download and
+                        errors are returned along with the weather.
 
 See https://github.com/xames3/charlotte for cloning the repository.
 """
@@ -19,6 +40,33 @@ See https://github.com/xames3/charlotte for cloning the repository.
 #
 #   < Checkout my GitHub repo for history and latest stable build >
 #
+#   2.1.0 - `_get_coords` now caches the coords & place names of the
+#           locations with a time to live. Current location is cached
+#           separately for a shorter time.
+#           Imports are now from the reworked utils modules.
+#           `forecast` now uses `ForecastCache` for the api responses.
+#           All network calls now go through the pooled sessions of the
+#           http module. Google Maps client is now created only once.
+#           Added `forecast_async` which overlaps the geocoding, place
+#           name lookup & forecast download. `_get_coords` is now split
+#           into `_geocode` & `_place_name` and the reply is composed by
+#           `_reply`.
+#           Replies are now rendered from the `forecast` templates of the
+#           phrases module, hence only the selected reply is formatted.
+#           Added `forecast_many` for fetching the weather of many
+#           locations concurrently.
+#           Condition summaries are now rewritten by `normalize_condition`
+#           using the rules table instead of the chain of replacements.
+#           Added `weather_async` which returns the place & condition
+#           along with the reply & raises ConnectionError when offline.
+#           `weather_async` now trusts the results of the real calls & uses
+#           the connectivity monitor only to fail fast.
+#           Error responses of the forecast api are raised instead of
+#           being cached as forecasts.
+#           Coords are not cached if the place name is not found & the
+#           lazily created cache & client are now guarded by a lock.
+#           Added `forecast_cache_stats` & the cache counters are now
+#           updated under the lock.
 #   1.1.1 - Updated entire script.
 #           Made the code more* PEP-8 compliant.
 #           Profiled and optimized using `profiler`.
@@ -50,12 +98,267 @@ See https://github.com/xames3/charlotte for cloning the repository.
 #           function.
 #   1.0.0 - First code.
 
+from concurrent.futures import Executor, Future
+from functools import lru_cache
 from inspect import stack
 from sys import exc_info
-from typing import Optional, Text, Tuple, Union
+from threading import Lock, Thread
+from time import time
+from typing import (Any, Callable, Dict, Iterable, Iterator, Optional, Text,
+                    Tuple, Union)
 
-from charlotte.utils.assists.constants import DARK, DAWN, DUSK, NOON
-from charlotte.utils.assists.system import check_internet, resolve_days
+from charlotte.utils.cache import LRUCache
+from charlotte.utils.constants import (CURRENT_LOCATION_TTL, DARK, DAWN,
+                                       DUSK, FORECAST_GRID, FORECAST_STALE,
+                                       FORECAST_TTL, FORECAST_URL,
+                                       FORECAST_WORKERS, GEOCODE_CACHE_SIZE,
+                                       GEOCODE_TTL, NOON)
+from charlotte.utils.generic import resolve_days
+from charlotte.utils.http import get, session
+from charlotte.utils.paths import files
+from charlotte.utils.phrases import replies
+from charlotte.utils.system import check_internet, connectivity
+
+_geocodes = None
+
+_maps = None
+_lock = Lock()
+
+
+class ForecastCache:
+    """In-memory forecast cache.
+
+    maxsize: Maximum number of grid cells kept in the memory.
+             Default: 128
+    grid:    Size of the grid cell in degrees. Coords in the same cell
+             share the forecast.
+             Default: `FORECAST_GRID`
+    ttl:     Seconds for which each block of the response stays fresh.
+             Default: `FORECAST_TTL`
+    stale:   Seconds after expiry for which the stale response is served
+             while it is refreshed in background.
+             Default: `FORECAST_STALE`
+
+    Caches the forecast responses keyed by the grid cell & units. The
+    `currently` block expires sooner than the `hourly` & `daily` blocks,
+    hence follow-up questions are answered from the memory.
+
+    Note: Hits, stale hits & misses are counted and can be read using
+    `stats`.
+    """
+
+    def __init__(self,
+                 maxsize: int = 128,
+                 grid: float = FORECAST_GRID,
+                 ttl: Dict[Text, int] = FORECAST_TTL,
+                 stale: int = FORECAST_STALE) -> None:
+        self.grid = grid
+        self.ttl = ttl
+        self.stale = stale
+        self.hits = self.stale_hits = self.misses = 0
+        self._entries = LRUCache(maxsize)
+        self._refreshing = set()
+        self._lock = Lock()
+
+    def key(self, lat: float, lng: float, units: Text) -> Tuple:
+        """Returns grid cell of the coords along with units."""
+        return round(lat / self.grid), round(lng / self.grid), units
+
+    def stats(self) -> Dict[Text, int]:
+        """Returns hit & miss counters of the cache."""
+        with self._lock:
+            return {'hits': self.hits, 'stale_hits': self.stale_hits,
+                    'misses': self.misses, 'size': len(self._entries)}
+
+    def get(self,
+            lat: float,
+            lng: float,
+            units: Text,
+            blocks: Iterable[Text],
+            fetch: Callable[[], Dict]) -> Dict:
+        """Returns forecast response of the coords.
+
+        lat:    Latitude of the location.
+        lng:    Longitude of the location.
+        units:  Units of the forecast response.
+        blocks: Blocks of the response which are needed, like `daily`.
+        fetch:  Function which fetches the response from the api.
+
+        Returns cached response if the needed blocks are fresh. Stale
+        responses are returned while they are refreshed in background,
+        else the response is fetched right away.
+
+        Note: Only the responses returned by the fetch are cached, hence
+        the fetch should raise on error responses.
+        """
+        key = self.key(lat, lng, units)
+        entry = self._entries.get(key)
+        # Responses without the needed blocks are fetched again.
+        if entry is not None and all(block in entry[0] for block in blocks):
+            obj, fetched = entry
+            age = time() - fetched
+            expiry = min(self.ttl.get(block, 0) for block in blocks)
+            if age < expiry:
+                with self._lock:
+                    self.hits += 1
+                return obj
+            if age < expiry + self.stale:
+                with self._lock:
+                    self.stale_hits += 1
+                self._revalidate(key, fetch)
+                return obj
+        with self._lock:
+            self.misses += 1
+        obj = fetch()
+        self._entries.set(key, (obj, time()))
+        return obj
+
+    def _revalidate(self, key: Tuple, fetch: Callable[[], Dict]) -> None:
+        """Refreshes the response of the key in background."""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def _refresh() -> None:
+            try:
+                self._entries.set(key, (fetch(), time()))
+            except Exception:
+                # Stale response stays till the next successful refresh.
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        Thread(target=_refresh, daemon=True).start()
+
+
+_forecasts = ForecastCache()
+
+
+def forecast_cache_stats() -> Dict[Text, int]:
+    """Returns hit & miss counters of the forecast cache."""
+    return _forecasts.stats()
+
+
+# Rewrites of the condition summaries keyed by their first word. Each
+# rule has the replacement of the first word & True if the summary needs
+# to be followed by `weather`.
+CONDITION_RULES = {
+    'possible': ('possible to have', True),
+    'light': ('possible to have light', True),
+    'heavy': ('possible to have heavy', True),
+    'rain': ('rainy weather', False)}
+
+# Summaries ending with these words are followed by `weather`.
+CONDITION_ENDINGS = ('cloudy',)
+
+
+@lru_cache(maxsize=1024)
+def normalize_condition(summary: Text) -> Text:
+    """Returns condition summary suitable for the replies.
+
+    summary: Summary of the forecast block, for e.g: `Light rain.`
+
+    Rewrites the summary using `CONDITION_RULES` in a single pass. Only
+    the first word is replaced & `weather` is added at most once, hence
+    the rules never compound.
+
+    Note: The api returns only few hundred distinct summaries, hence the
+    normalized summaries are memoized. See `benchmarks/conditions.py` to
+    compare the rules against the corpus of the summaries.
+    """
+    cond = summary.lower().strip().strip('.')
+    head, space, rest = cond.partition(' ')
+    replacement, weather = CONDITION_RULES.get(head, (head, False))
+    cond = replacement + space + rest
+    if (weather or cond.endswith(CONDITION_ENDINGS)) and \
+            not cond.endswith('weather'):
+        cond += ' weather'
+    return cond
+
+
+def _geocode_key(location: Optional[Text] = None) -> Tuple:
+    """Returns cache key of the location.
+
+    Locations are normalized, hence `New York`, `new york` & `New York,`
+    share the same key.
+    """
+    if not location:
+        return ('current',)
+    return ('place', ' '.join(location.lower().replace(',', ' ').split()))
+
+
+def _geocode_cache() -> LRUCache:
+    """Returns the on-disk cache of the geocoded locations."""
+    global _geocodes
+    with _lock:
+        if _geocodes is None:
+            _geocodes = LRUCache(GEOCODE_CACHE_SIZE, files['geocodes'],
+                                 GEOCODE_TTL)
+    return _geocodes
+
+
+def _remember(location: Optional[Text],
+              coords: Tuple[float, float],
+              loc: Optional[Text]) -> None:
+    """Caches the coords & place name of the location.
+
+    Nothing is cached if the place name is not found, hence the reverse
+    lookup is retried on the next request.
+    """
+    if loc is not None:
+        _geocode_cache().set(_geocode_key(location), (coords, loc),
+                             None if location else CURRENT_LOCATION_TTL)
+
+
+def _geocode(location: Optional[Text] = None) -> Tuple[float, float]:
+    """Returns latitude & longitude of the location.
+
+    Finds coords of the location using Google Maps API. If location is
+    None, current global position is returned.
+    """
+    import os
+    from googlemaps import Client
+
+    global _maps
+    # Passing Google maps API key. The client is created once and uses
+    # the shared session, hence the connections are reused.
+    with _lock:
+        if _maps is None:
+            _maps = Client(key=os.environ.get('CHARLOTTE_MAPS_KEY'),
+                           requests_session=session())
+    if location:
+        curr = _maps.geocode(location)
+        return (curr[0]['geometry']['location']['lat'],
+                curr[0]['geometry']['location']['lng'])
+    curr = _maps.geolocate()
+    return curr['location']['lat'], curr['location']['lng']
+
+
+def _place_name(coords: Tuple[float, float]) -> Optional[Text]:
+    """Returns name of the place at the coords using reverse lookup."""
+    from geocoder import osm
+
+    area = osm(coords, method='reverse', session=session())
+    loc_list = ['city', 'town', 'suburb', 'state', 'region', 'country']
+    for idx in loc_list:
+        if area.json.get(idx, None) is not None:
+            return area.json[idx]
+    return None
+
+
+def _resolve(location: Optional[Text] = None) -> Tuple:
+    """Returns cached coords & place name, raises if geocoding fails."""
+    key = _geocode_key(location)
+    cached = _geocode_cache().get(key)
+    if cached is not None:
+        return cached
+    coords = _geocode(location)
+    # Reverse mapping the coordinates to find out the city name.
+    loc = _place_name(coords)
+    _remember(location, coords, loc)
+    return coords, loc
 
 
 def _get_coords(location: Optional[Text] = None) -> Tuple:
@@ -66,7 +369,10 @@ def _get_coords(location: Optional[Text] = None) -> Tuple:
               Default: None
 
     Find and returns current global position and the city using reverse
-    lookup via Google Maps API.
+    lookup via Google Maps API. Results are cached on the disk for
+    `GEOCODE_TTL` seconds, hence repeat queries for the same location skip
+    the geocoding entirely. Current location is cached only for
+    `CURRENT_LOCATION_TTL` seconds as it may change.
 
     Note: Function uses Google Maps for retreiving latitude & longitude
     using it`s API. Hence it is necessary to generate the API key first
@@ -76,30 +382,8 @@ def _get_coords(location: Optional[Text] = None) -> Tuple:
     Caution: If you run the function without passing valid API key, it
     will raise an exception.
     """
-    import os
-    from geocoder import osm
-    from googlemaps import Client
-
     try:
-        # Passing Google maps API key.
-        map = Client(key=os.environ.get('CHARLOTTE_MAPS_KEY'))
-        # Finding current latitude and longitude coordinates.
-        if location:
-            curr = map.geocode(location)
-            coords = (curr[0]['geometry']['location']['lat'],
-                      curr[0]['geometry']['location']['lng'])
-        else:
-            curr = map.geolocate()
-            coords = (curr['location']['lat'],
-                      curr['location']['lng'])
-        # Reverse mapping the coordinates to find out the city name.
-        area = osm(coords, method='reverse')
-        loc_list = ['city', 'town', 'suburb', 'state', 'region', 'country']
-        for idx in loc_list:
-            if area.json.get(idx, None) is not None:
-                loc = area.json[idx]
-                break
-        return coords, loc
+        return _resolve(location)
     except Exception as error:
         print('An error occured while performing this operation because of '
               f'{error} in function "{stack()[0][3]}" on line '
@@ -140,6 +424,101 @@ def _part_day() -> Text:
     return part
 
 
+def _forecast_blocks(days: Optional[int] = None,
+                     hours: Optional[int] = None) -> Tuple[Text, Text]:
+    """Returns blocks of the forecast response used in the reply."""
+    if days and days <= 7 and days > 0:
+        return 'currently', 'daily'
+    if hours and hours <= 48:
+        return 'hourly', 'daily'
+    return 'currently', 'daily'
+
+
+def _fetch_forecast(coords: Tuple[float, float],
+                    days: Optional[int] = None,
+                    hours: Optional[int] = None,
+                    metric: bool = True) -> Dict:
+    """Returns forecast response of the coords.
+
+    Only the blocks used in the reply decide if the cached response is
+    still fresh.
+    """
+    import os
+
+    lat, lng = coords
+    key = os.environ.get('CHARLOTTE_DSKY_KEY')
+    u = 'si' if metric else 'us'
+    url = f'{FORECAST_URL}/{key}/{lat},{lng}?units={u}'
+    return _forecasts.get(lat, lng, u, _forecast_blocks(days, hours),
+                          lambda: _download(url))
+
+
+def _download(url: Text) -> Dict:
+    """Returns forecast response, raises if it is not a forecast.
+
+    Error responses, like exceeded quota are raised instead of being
+    returned, hence they are never cached as forecasts.
+    """
+    response = get(url)
+    response.raise_for_status()
+    obj = response.json()
+    missing = [block for block in ('currently', 'hourly', 'daily')
+               if not isinstance(obj.get(block), dict)]
+    if missing:
+        raise ValueError(f'Forecast response has no {", ".join(missing)} '
+                         'block.')
+    return obj
+
+
+def _block(obj: Dict,
+           days: Optional[int] = None,
+           hours: Optional[int] = None) -> Tuple[Dict, Text]:
+    """Returns block of the forecast response & it`s template group."""
+    if days and days <= 7 and days > 0:
+        return obj['daily']['data'][days], 'days'
+    if hours and hours <= 48:
+        return obj['hourly']['data'][hours], 'hours'
+    return obj['currently'], 'now'
+
+
+def _reply(obj: Dict,
+           loc: Optional[Text],
+           days: Optional[int] = None,
+           hours: Optional[int] = None,
+           metric: bool = True) -> Text:
+    """Returns the weather reply composed from the forecast response."""
+    t, s = ('°C', 'kph') if metric else ('°F', 'mph')
+    data, group = _block(obj, days, hours)
+    if group == 'hours':
+        temp = str(data['temperature']) + t
+        feel = str(data['apparentTemperature']) + t
+    else:
+        temp = str(obj['currently']['temperature']) + t
+        feel = str(obj['currently']['apparentTemperature']) + t
+    if group == 'days':
+        max = str(data['apparentTemperatureMax']) + t
+        min = str(data['apparentTemperatureMin']) + t
+    else:
+        max = str(obj['daily']['data'][0]['apparentTemperatureMax']) + t
+        min = str(obj['daily']['data'][0]['apparentTemperatureMin']) + t
+    cond = normalize_condition(str(data['summary']))
+    hum = str(data['humidity'] * 100) + '%'
+    spd = str(data['windSpeed']) + f' {s}'
+    fore = obj['daily']['summary']
+    cloud = data['cloudCover']
+    deg = data['windBearing']
+    sky = 'brighter' if cloud < 0.5 else 'darker'
+    dir = _wind_dir(deg)
+    part = _part_day()
+    day = resolve_days(days)
+    pl = 'day' if days == 1 else 'days'
+    # Only the selected template is rendered.
+    return replies.render(f'forecast.{group}', days=days, hours=hours,
+                          pl=pl, loc=loc, cond=cond, fore=fore, feel=feel,
+                          temp=temp, max=max, min=min, hum=hum, spd=spd,
+                          sky=sky, dir=dir, part=part, day=day)
+
+
 def forecast(location: Optional[Text] = None,
              days: Optional[int] = None,
              hours: Optional[int] = None,
@@ -164,138 +543,18 @@ def forecast(location: Optional[Text] = None,
 
     Note: An account on `https://darksky.net/` is required to get the
     api key. API call is made to retreive the weather report. Only 1000
-    calls can be made per month on the free tier.
+    calls can be made per month on the free tier. Responses are cached
+    by `ForecastCache`, hence repeat queries for the same place do not
+    use up the calls.
 
     Caution: If you run the function without passing valid API key, it
     will raise an exception.
     """
-    import os
-    from random import choice, shuffle
-    from requests import get
-
     try:
         if check_internet():
-            (lat, lng), loc = _get_coords(location)
-            key = os.environ.get('CHARLOTTE_DSKY_KEY')
-            u, t, s = ('si', '°C', 'kph') if metric else ('us', '°F', 'mph')
-            url = f'https://api.darksky.net/forecast/{key}/' \
-                  f'{lat},{lng}?units={u}'
-            obj = get(url).json()
-            if days and days <= 7 and days > 0:
-                data, idx = obj['daily']['data'][days], 0
-                temp = str(obj['currently']['temperature']) + t
-                feel = str(obj['currently']['apparentTemperature']) + t
-                max = str(data['apparentTemperatureMax']) + t
-                min = str(data['apparentTemperatureMin']) + t
-            elif hours and hours <= 48:
-                data, idx = obj['hourly']['data'][hours], 1
-                temp = str(data['temperature']) + t
-                feel = str(data['apparentTemperature']) + t
-                max = str(obj['daily']['data'][0]['apparentTemperatureMax']) \
-                    + t
-                min = str(obj['daily']['data'][0]['apparentTemperatureMin']) \
-                    + t
-            else:
-                data, idx = obj['currently'], 2
-                temp = str(obj['currently']['temperature']) + t
-                feel = str(obj['currently']['apparentTemperature']) + t
-                max = str(obj['daily']['data'][0]['apparentTemperatureMax']) \
-                    + t
-                min = str(obj['daily']['data'][0]['apparentTemperatureMin']) \
-                    + t
-            cond = str(data['summary']).lower().strip('.')
-            if cond.startswith('possible'):
-                cond = cond.replace('possible', 'possible to have') + \
-                    ' weather'
-            if cond.startswith('rain'):
-                cond = cond.replace('rain', 'rainy weather')
-            if cond.endswith('cloudy'):
-                cond = cond + ' weather'
-            if cond.startswith('light'):
-                cond = cond.replace('light', 'possible to have light') + \
-                    ' weather'
-            if cond.startswith('heavy'):
-                cond = cond.replace('heavy', 'possible to have heavy') + \
-                    ' weather'
-            hum = str(data['humidity'] * 100) + '%'
-            spd = str(data['windSpeed']) + f' {s}'
-            fore = obj['daily']['summary']
-            cloud = data['cloudCover']
-            deg = data['windBearing']
-            sky = 'brighter' if cloud < 0.5 else 'darker'
-            dir = _wind_dir(deg)
-            part = _part_day()
-            day = resolve_days(days)
-            pl = 'day' if days == 1 else 'days'
-            _days = [f'For the next {days} {pl} there are some places in '
-                     f'{loc} that will be {cond}. Interestingly, there would '
-                     f'be {fore}',
-                     f'Well it does look as if we\'ll see more {cond} across '
-                     f'{loc} for the next {days} {pl}. More so there will be '
-                     f'{fore}',
-                     f'Some parts of {loc} will be seeing a bit of {cond} for '
-                     f'the next {days} {pl} with average temperature of {feel}'
-                     f'. But for the most part it\'ll fluctuate between {max} '
-                     f'high & {min} low.',
-                     f'Well for the next {days} {pl}, it seems it\'ll be '
-                     f'fairly {cond} in some parts of {loc}. Winds can be '
-                     f'seen gushing at speeds upto {spd} and as we go '
-                     'through the week the temperature will vary between '
-                     f'{max} high & {min} low.',
-                     f'I could see some {sky} skies over {dir} parts of {loc} '
-                     f'for the next {days} {pl}. Also we do have some {cond} '
-                     'spells with the temperature struggling to be '
-                     f'about {temp}.',
-                     f'For {day} it is forecasted that there are some places '
-                     f'in {loc} that will be {cond}. Interestingly, there '
-                     f'would be {fore}',
-                     f'Some parts of {loc} will be seeing a bit of {cond} by '
-                     f'{day} with average temperature of {feel}. But for the '
-                     f'most part it\'ll fluctuate between {max} high & '
-                     f'{min} low.',
-                     f'Well till {day}, it seems it\'ll be fairly {cond} in '
-                     f'some parts of {loc}. Winds can be seen gushing at '
-                     f'speeds upto {spd} and as we go through the week the '
-                     f'temperature will vary between {max} high & {min} low.']
-            _hrs = [f'We are going to see {cond} in the next {hours} hours '
-                    f'with {sky} skies in some parts {loc} with temperature '
-                    f'fluctuating between {max} high & {min} low.',
-                    f'There is going to be {cond} here in {loc} for the next '
-                    f'{hours} hours, also we may experience {sky} skies with '
-                    f'temperatures spiking upto {temp}.']
-            _now = [f'Well, it is {cond} in some places across much of {loc}. '
-                    f'Having said that the temperature has been around {temp} '
-                    'roughly and will stay the same for the most part of the '
-                    f'{part}.',
-                    f'It is {cond} in {dir} parts of {loc}. We will however '
-                    f'see the temperature between {min} & {max}. '
-                    f'Interestingly, there would be {fore}',
-                    f'It is {cond} across {dir} {loc} especially in the early '
-                    f'hours. It\'s the expected humidity of {hum} with the '
-                    'unsettling breeze is affecting the average temperature '
-                    f'of {feel}.',
-                    f'Looking at {loc} from above, it is {cond}. While some '
-                    f'of the areas in {dir} {loc} would get as low as {min} '
-                    f'& as high as {max} because of the humidity.',
-                    f'Well from above here, it seems it is {cond}. Winds can '
-                    f'be seen gushing at speeds upto {spd} across {loc} and '
-                    f'as we go throughout the {part} the temperature will'
-                    f' vary between {max} high & {min} low.',
-                    f'Most likely it is {cond}. However, we could see '
-                    f'temperature rise upto {temp} over the grounds of {dir} '
-                    f'parts of {loc}. Interestingly, there would be {fore}',
-                    f'In the {part} we shall witness {cond} in places across '
-                    f'{loc}. It\'s a fine start to the {part} but we\'ve got '
-                    'some windy weather which should feel relatively pleasant '
-                    f'with the temperature slightly above {temp}.',
-                    f'The temperature in {loc} is going to stay between '
-                    f'{temp} & {feel} all {part} with a bit of {cond} in the '
-                    f'{dir} parts. However, it\'ll be {fore}']
-
-            response = _days if idx == 0 else _hrs if idx == 1 else _now
-            shuffle(response)
-
-            return choice(response)
+            coords, loc = _get_coords(location)
+            obj = _fetch_forecast(coords, days, hours, metric)
+            return _reply(obj, loc, days, hours, metric)
         else:
             # Returns None if no internet connection is available.
             return None
@@ -303,3 +562,186 @@ def forecast(location: Optional[Text] = None,
         print('An error occured while performing this operation because of '
               f'{error} in function "{stack()[0][3]}" on line '
               f'{exc_info()[-1].tb_lineno}.')
+
+
+async def forecast_async(location: Optional[Text] = None,
+                         days: Optional[int] = None,
+                         hours: Optional[int] = None,
+                         metric: bool = True,
+                         executor: Optional[Executor] = None) -> Text:
+    """Returns weather without blocking the event loop.
+
+    location: Location where you need to find the weather forecast for.
+              This location can be any valid address, city, etc.
+              Default: None (Current location)
+    days:     Number of days, for which the forecast is needed. Maximum
+              7 days forecast is currently possible.
+              Default: None (Todays`s forecast)
+    hours:    Number of hours, for which the forecast is needed. Maximum
+              of 48 hours of forecast is currently possible.
+              Default: None (Current weather)
+    metric:   Unit metrics to be used, Metric or Imperial.
+              Default: True
+    executor: Executor in which the network calls are run.
+              Default: None (Default executor of the event loop)
+
+    Returns the same weather as `forecast`, but the independent calls
+    are made concurrently. The place name is looked up while the
+    forecast is downloaded, as the forecast needs only the coords.
+
+    Note: This function is meant to be awaited by the action server,
+    hence a slow api call does not block the other conversations.
+    """
+    try:
+        return (await weather_async(location, days, hours, metric,
+                                    executor))[0]
+    except ConnectionError:
+        # Returns None if no internet connection is available.
+        return None
+    except Exception as error:
+        print('An error occured while performing this operation because of '
+              f'{error} in function "{stack()[0][3]}" on line '
+              f'{exc_info()[-1].tb_lineno}.')
+
+
+async def weather_async(location: Optional[Text] = None,
+                        days: Optional[int] = None,
+                        hours: Optional[int] = None,
+                        metric: bool = True,
+                        executor: Optional[Executor] = None) -> Tuple:
+    """Returns weather along with the place & condition.
+
+    location: Location where you need to find the weather forecast for.
+              Default: None (Current location)
+    days:     Number of days, for which the forecast is needed.
+              Default: None (Todays`s forecast)
+    hours:    Number of hours, for which the forecast is needed.
+              Default: None (Current weather)
+    metric:   Unit metrics to be used, Metric or Imperial.
+              Default: True
+    executor: Executor in which the network calls are run.
+              Default: None (Default executor of the event loop)
+
+    Returns the reply of `forecast_async` along with the name of the
+    place & the normalized condition, which the action server stores in
+    it`s slots.
+
+    Note: Unlike `forecast_async`, the errors are raised. ConnectionError
+    is raised if no internet connection is available, hence it can be
+    told apart from the rest of the errors. Results of the real calls
+    are trusted over the connectivity monitor, which is consulted only
+    to fail fast & to tell if a failed call was due to no internet.
+    """
+    import asyncio
+
+    from googlemaps.exceptions import Timeout as MapsTimeout
+    from googlemaps.exceptions import TransportError
+    from requests import ConnectionError as RequestsConnectionError
+    from requests import Timeout
+
+    loop = asyncio.get_running_loop()
+
+    def _run(func: Callable, *args: Any) -> asyncio.Future:
+        return loop.run_in_executor(executor, func, *args)
+
+    if connectivity().failing():
+        # Recent network calls could not connect, hence no call is made.
+        raise ConnectionError('No internet connection available.')
+    try:
+        key = _geocode_key(location)
+        cached = await _run(lambda: _geocode_cache().get(key))
+        if cached is None:
+            coords = await _run(_geocode, location)
+            loc, obj = await asyncio.gather(
+                _run(_place_name, coords),
+                _run(_fetch_forecast, coords, days, hours, metric))
+            await _run(_remember, location, coords, loc)
+        else:
+            coords, loc = cached
+            obj = await _run(_fetch_forecast, coords, days, hours, metric)
+    except (ConnectionError, MapsTimeout, RequestsConnectionError, Timeout,
+            TransportError) as error:
+        # Call has failed, the monitor only tells if it was because of no
+        # internet connection.
+        if not await _run(check_internet):
+            raise ConnectionError('No internet connection '
+                                  'available.') from error
+        raise
+    cond = normalize_condition(str(_block(obj, days, hours)[0]['summary']))
+    return _reply(obj, loc, days, hours, metric), loc, cond
+
+
+def forecast_many(locations: Iterable[Optional[Text]],
+                  days: Optional[int] = None,
+                  hours: Optional[int] = None,
+                  metric: bool = True,
+                  workers: Optional[int] = None) -> Iterator[Tuple]:
+    """Returns weather of many locations.
+
+    locations: Locations where you need to find the weather forecast
+               for. None stands for the current location.
+    days:      Number of days, for which the forecast is needed. Maximum
+               7 days forecast is currently possible.
+               Default: None (Todays`s forecast)
+    hours:     Number of hours, for which the forecast is needed. Maximum
+               of 48 hours of forecast is currently possible.
+               Default: None (Current weather)
+    metric:    Unit metrics to be used, Metric or Imperial.
+               Default: True
+    workers:   Maximum number of concurrent network calls.
+               Default: None (`FORECAST_WORKERS`)
+
+    Yields the location, it`s weather & the error, if any, as soon as
+    each forecast is ready. Locations are geocoded concurrently and the
+    locations which fall in the same grid cell share a single forecast
+    download.
+
+    Note: Failure of a location does not stop the batch, it is yielded
+    with None as the weather along with the raised exception.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    locations = list(dict.fromkeys(locations))
+    if not check_internet():
+        for location in locations:
+            yield location, None, ConnectionError('No internet connection '
+                                                  'is available.')
+        return
+
+    def _result(fetched: Future, location: Optional[Text],
+                loc: Optional[Text]) -> Tuple:
+        try:
+            return location, _reply(fetched.result(), loc, days, hours,
+                                    metric), None
+        except Exception as error:
+            return location, None, error
+
+    units = 'si' if metric else 'us'
+    with ThreadPoolExecutor(workers or FORECAST_WORKERS) as executor:
+        pending = {executor.submit(_resolve, location): location
+                   for location in locations}
+        cells, waiting = {}, {}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = pending.pop(future)
+                if task in cells and cells[task] is future:
+                    # Forecast of the cell is ready for all it`s locations.
+                    for location, loc in waiting.pop(task):
+                        yield _result(future, location, loc)
+                    continue
+                try:
+                    coords, loc = future.result()
+                except Exception as error:
+                    yield task, None, error
+                    continue
+                cell = _forecasts.key(*coords, units)
+                if cell not in cells:
+                    cells[cell] = executor.submit(_fetch_forecast, coords,
+                                                  days, hours, metric)
+                    pending[cells[cell]] = cell
+                if cell in waiting or cells[cell] in pending:
+                    waiting.setdefault(cell, []).append((task, loc))
+                else:
+                    # Cell was downloaded before this location resolved.
+                    yield _result(cells[cell], task, loc)
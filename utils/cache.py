@@ -0,0 +1,219 @@
+"""
+The cache module: Provides in-memory caches with on-disk backing store.
+
+These caches help to avoid repeating the expensive operations like
+parsing files or making network calls, by remembering their results.
+
+At a glance, the structure of the module is following:
+ - LRUCache():          Least recently used cache with a size bound &
+                        optional time to live for the entries. If a file
+                        is given, the entries are also written to a
+                        SQLite backed store on disk, hence they survive
+                        the restarts. Entries evicted from the memory
+                        are looked up on the disk before they are
+                        treated as missing. The store on disk has it`s
+                        own size bound.
+
+See https://github.com/xames3/charlotte for cloning the repository.
+"""
+#   History:
+#
+#   < Checkout my GitHub repo for history and latest stable build >
+#
+#   2.1.0 - First code.
+
+import pickle
+import sqlite3
+from collections import OrderedDict
+from pathlib import Path
+from threading import RLock
+from time import time
+from typing import Any, Hashable, Optional, Text, Tuple, Union
+
+from charlotte.utils.system import make_dir
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Least recently used cache.
+
+    maxsize:  Maximum number of entries kept in the memory.
+              Default: 1024
+    file:     Path of the on-disk backing store. If None, entries are
+              kept only in the memory.
+              Default: None
+    ttl:      Seconds after which the entries expire. If None, entries
+              never expire.
+              Default: None
+    disksize: Maximum number of entries kept on the disk.
+              Default: None (Same as `maxsize`)
+
+    Entries are evicted from the memory in the least recently used
+    order. If the backing store is used, every entry is also written to
+    the disk & is read back when it is not found in the memory. Entries
+    exceeding the `disksize` are deleted from the disk in the order they
+    were last written or read from the disk. Expired entries are treated
+    as missing & are removed when they are read.
+
+    Note: Keys are stored on the disk using their `repr`, hence they
+    should be made of basic types like strings, numbers & tuples. Values
+    are pickled.
+    """
+
+    def __init__(self,
+                 maxsize: int = 1024,
+                 file: Optional[Text] = None,
+                 ttl: Optional[Union[float, int]] = None,
+                 disksize: Optional[int] = None) -> None:
+        self.maxsize = maxsize
+        self.file = file
+        self.ttl = ttl
+        self.disksize = disksize or maxsize
+        self._entries = OrderedDict()
+        self._lock = RLock()
+        self._connection = None
+        self._stored = 0
+        if file:
+            make_dir(Path(file).parent)
+            self._connection = sqlite3.connect(str(file),
+                                               check_same_thread=False)
+            with self._connection as connection:
+                connection.execute('CREATE TABLE IF NOT EXISTS cache '
+                                   '(key TEXT PRIMARY KEY, value BLOB, '
+                                   'expires REAL)')
+                # Stores made before the size bound have no access time.
+                columns = [row[1] for row in
+                           connection.execute('PRAGMA table_info(cache)')]
+                if 'accessed' not in columns:
+                    connection.execute('ALTER TABLE cache ADD COLUMN '
+                                       'accessed REAL DEFAULT 0')
+                connection.execute('CREATE INDEX IF NOT EXISTS '
+                                   'idx_cache_accessed ON cache (accessed)')
+                # Expired entries are dropped while opening the store.
+                connection.execute('DELETE FROM cache WHERE expires < ?',
+                                   (time(),))
+                self._stored = connection.execute(
+                    'SELECT COUNT(*) FROM cache').fetchone()[0]
+            self._trim()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self.set(key, value)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns value of the key, default if the key is missing."""
+        with self._lock:
+            if key in self._entries:
+                value, expires = self._entries[key]
+                if expires is None or expires > time():
+                    self._entries.move_to_end(key)
+                    return value
+                self.pop(key)
+                return default
+            value, expires = self._load(key)
+            if value is _MISSING:
+                return default
+            self._remember(key, value, expires)
+            return value
+
+    def set(self,
+            key: Hashable,
+            value: Any,
+            ttl: Optional[Union[float, int]] = None) -> None:
+        """Stores value of the key.
+
+        key:   Key of the value.
+        value: Value to be stored.
+        ttl:   Seconds after which the entry expires. If None, the time
+               to live of the cache is used.
+               Default: None
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires = None if ttl is None else time() + ttl
+        with self._lock:
+            self._remember(key, value, expires)
+            if self._connection:
+                with self._connection as connection:
+                    known = connection.execute(
+                        'SELECT 1 FROM cache WHERE key = ?',
+                        (repr(key),)).fetchone()
+                    connection.execute(
+                        'INSERT OR REPLACE INTO cache (key, value, expires, '
+                        'accessed) VALUES (?, ?, ?, ?)',
+                        (repr(key), pickle.dumps(value), expires, time()))
+                if known is None:
+                    self._stored += 1
+                    self._trim()
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Removes the key & returns it`s value."""
+        with self._lock:
+            value, _ = self._entries.pop(key, (_MISSING, None))
+            if value is _MISSING:
+                value, _ = self._load(key)
+            if self._connection:
+                with self._connection as connection:
+                    self._stored -= connection.execute(
+                        'DELETE FROM cache WHERE key = ?',
+                        (repr(key),)).rowcount
+            return default if value is _MISSING else value
+
+    def clear(self) -> None:
+        """Removes all the entries, including the ones on the disk."""
+        with self._lock:
+            self._entries.clear()
+            if self._connection:
+                with self._connection as connection:
+                    connection.execute('DELETE FROM cache')
+                self._stored = 0
+
+    def _remember(self,
+                  key: Hashable,
+                  value: Any,
+                  expires: Optional[float]) -> None:
+        """Stores value in the memory, evicting least recent entries."""
+        self._entries[key] = value, expires
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _load(self, key: Hashable) -> Tuple[Any, Optional[float]]:
+        """Returns value of the key & it`s expiry from the disk."""
+        if not self._connection:
+            return _MISSING, None
+        row = self._connection.execute('SELECT value, expires FROM cache '
+                                       'WHERE key = ?',
+                                       (repr(key),)).fetchone()
+        if row is None:
+            return _MISSING, None
+        with self._connection as connection:
+            if row[1] is not None and row[1] <= time():
+                self._stored -= connection.execute(
+                    'DELETE FROM cache WHERE key = ?', (repr(key),)).rowcount
+                return _MISSING, None
+            # Entries read from the disk are kept longer on the disk.
+            connection.execute('UPDATE cache SET accessed = ? WHERE key = ?',
+                               (time(), repr(key)))
+        return pickle.loads(row[0]), row[1]
+
+    def _trim(self) -> None:
+        """Deletes least recently used entries exceeding the disk size."""
+        excess = self._stored - self.disksize
+        if excess <= 0:
+            return
+        with self._connection as connection:
+            self._stored -= connection.execute(
+                'DELETE FROM cache WHERE key IN (SELECT key FROM cache '
+                'ORDER BY accessed LIMIT ?)', (excess,)).rowcount
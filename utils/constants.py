@@ -10,6 +10,14 @@ See https://github.com/xames3/charlotte for cloning the repository.
 #
 #   < Checkout my GitHub repo for history and latest stable build >
 #
+#   2.1.0 - Added constants for caching the geocodes & forecasts.
+#           Added `FORECAST_WORKERS` for the batched forecasts.
+#           Added constants for the pooled HTTP sessions & endpoints.
+#           Added constants for the connectivity monitor, which replace
+#           `CONNECTIVITY_URL`.
+#           Added constants for the window manager.
+#           Added constants for processing the datasets on the disk.
+#           Added `DATASET_CHUNK` for replacing the words using workers.
 #   2.0.0 - Added encoding: utf-8 value as a constant.
 #   1.1.1 - Added constants for day times.
 #           Made the code more* PEP-8 compliant.
@@ -32,3 +40,51 @@ DUSK = 17
 DARK = 21
 
 ENCODING = 'utf-8'
+
+GEOCODE_TTL = 30 * 24 * 60 * 60
+
+CURRENT_LOCATION_TTL = 15 * 60
+
+GEOCODE_CACHE_SIZE = 512
+
+FORECAST_GRID = 0.02
+
+FORECAST_TTL = {'currently': 10 * 60,
+                'hourly': 60 * 60,
+                'daily': 3 * 60 * 60}
+
+FORECAST_STALE = 60 * 60
+
+FORECAST_WORKERS = 8
+
+HTTP_POOL_SIZE = 10
+
+HTTP_RETRIES = 3
+
+HTTP_BACKOFF = 0.3
+
+HTTP_TIMEOUT = (3.05, 10.0)
+
+FORECAST_URL = 'https://api.darksky.net/forecast'
+
+CONNECTIVITY_ENDPOINT = ('1.1.1.1', 53)
+
+CONNECTIVITY_TIMEOUT = 1.5
+
+CONNECTIVITY_TTL = 30
+
+CONNECTIVITY_INTERVAL = 15
+
+WINDOW_TTL = 2.0
+
+WINDOW_TIMEOUT = 5.0
+
+WINDOW_POLL = 0.05
+
+DATASET_MEMORY = 256 * 1024 * 1024
+
+DATASET_FAN_IN = 64
+
+DATASET_BUFFER = 1 << 20
+
+DATASET_CHUNK = 10000
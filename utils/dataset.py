@@ -8,16 +8,24 @@ fix or modify the training data.
 At a glance, the structure of the module is following:
  - sort_lines():        Sorts the lines in the file and saves it. This
                         function is used to debug any redundancies in
-                        NLU data.
+                        NLU data. Files bigger than the memory budget
+                        are sorted on the disk using external merge
+                        sort.
  - randomize_lines():   Randomizes the lines in the file. This function
                         is used to make the dataset slightly random.
+                        Files bigger than the memory budget are shuffled
+                        on the disk using bucket files.
  - replace_data():      Randomly replaces the given words in the file
                         with required word and saves it. It is
                         recommended to use this to replace the common
-                        words OR patterns in your dataset.
+                        words OR patterns in your dataset. Writes one,
+                        many or every variant of the lines using worker
+                        processes.
  - delete_lines():      Randomly deletes lines from the file and saves
                         it. It is recommended to use this function for
-                        shrinking the dataset.
+                        shrinking the dataset. Lines are sampled without
+                        replacement in a single pass, optionally under
+                        every intent header & drops the duplicates.
 
 See https://github.com/xames3/charlotte for cloning the repository.
 """
@@ -25,97 +33,533 @@ See https://github.com/xames3/charlotte for cloning the repository.
 #
 #   < Checkout my GitHub repo for history and latest stable build >
 #
+#   2.1.0 - `sort_lines` now sorts the files bigger than the memory budget
+#           using external merge sort & replaces the file atomically.
+#           `delete_lines` now samples the lines without replacement using
+#           reservoir sampling, with optional seed & stratification by the
+#           intent headers. Duplicates are dropped while sampling.
+#           `randomize_lines` now shuffles the files bigger than the memory
+#           budget on the disk & drops the duplicates only if asked.
+#           Fixed `replace_data`, which now finds the words using a single
+#           regex & writes the variants of the lines using the workers.
 #   2.0.0 - First code.
 
-from typing import List, NoReturn, Text
+from contextlib import ExitStack
+from typing import (IO, Any, Callable, Iterable, Iterator, List, NoReturn,
+                    Optional, Pattern, Text, Tuple)
 
-from charlotte.utils.constants import ENCODING
+from charlotte.utils.constants import (DATASET_BUFFER, DATASET_CHUNK,
+                                       DATASET_FAN_IN, DATASET_MEMORY,
+                                       ENCODING)
+from charlotte.utils.system import atomic_write
 
 
-def sort_lines(file: Text) -> NoReturn:
+def _lines(src_file: IO) -> Iterator[Text]:
+    """Yields lines of the file, each ending with a newline."""
+    for line in src_file:
+        yield line if line.endswith('\n') else line + '\n'
+
+
+def _chunks(lines: Iterable[Text], memory: int) -> Iterator[List[Text]]:
+    """Yields chunks of the lines which fit in the memory budget."""
+    from sys import getsizeof
+
+    chunk, size = [], 0
+    for line in lines:
+        chunk.append(line)
+        size += getsizeof(line)
+        if size >= memory:
+            yield chunk
+            chunk, size = [], 0
+    if chunk:
+        yield chunk
+
+
+def _unique(lines: Iterable[Text]) -> Iterator[Text]:
+    """Yields sorted lines skipping the consecutive duplicates."""
+    previous = None
+    for line in lines:
+        if line != previous:
+            yield line
+            previous = line
+
+
+def _distinct(items: Iterable[Tuple[int, Text]]) -> Iterator[Tuple[int, Text]]:
+    """Yields numbered lines skipping the lines seen before.
+
+    Only the hashes of the lines are held in the memory instead of the
+    lines themselves.
+    """
+    seen = set()
+    for idx, line in items:
+        key = hash(line)
+        if key not in seen:
+            seen.add(key)
+            yield idx, line
+
+
+def _merge(runs: List[Text], dst_file: IO, dedupe: bool = True) -> None:
+    """Merges sorted runs into the file."""
+    from heapq import merge
+
+    with ExitStack() as stack:
+        sources = [stack.enter_context(open(run, encoding=ENCODING,
+                                            buffering=DATASET_BUFFER))
+                   for run in runs]
+        merged = merge(*sources)
+        dst_file.writelines(_unique(merged) if dedupe else merged)
+
+
+def _reservoir(items: Iterable[Any], size: int, random: Any) -> List[Any]:
+    """Returns random sample of the items without replacement.
+
+    Samples the items in a single pass using reservoir sampling with
+    geometric skips (Algorithm L), hence only `size` items are held in
+    the memory & the random numbers are drawn only for the items which
+    enter the reservoir.
+    """
+    from itertools import islice
+    from math import expm1, floor, log
+
+    items = iter(items)
+    if size <= 0:
+        # Items are still read, hence the callers reading the rest of
+        # the items as a side effect see all of them.
+        for _ in items:
+            pass
+        return []
+    reservoir = list(islice(items, size))
+    if len(reservoir) < size:
+        return reservoir
+    # Logarithm of the weight is kept, hence the weight never rounds off
+    # to 1 for the large reservoirs. Uniform values are kept above 0.
+    weight = log(random.random() or 5e-324) / size
+    while True:
+        skip = floor(log(random.random() or 5e-324) / log(-expm1(weight)))
+        item = next(islice(items, skip, skip + 1), None)
+        if item is None:
+            return reservoir
+        reservoir[random.randrange(size)] = item
+        weight += log(random.random() or 5e-324) / size
+
+
+def _batches(lines: Iterable[Text], size: int) -> Iterator[List[Text]]:
+    """Groups lines into lists of `size`."""
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _imap(function: Callable,
+          tasks: Iterable[Any],
+          workers: Optional[int] = None) -> Iterator[Any]:
+    """Yields results of the tasks in order, using worker processes.
+
+    Only a couple of tasks per worker are submitted ahead of the results
+    being read, hence the tasks are not read all at once.
+    """
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+    from os import cpu_count
+
+    workers = workers or cpu_count() or 1
+    if workers == 1:
+        yield from map(function, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for task in tasks:
+            pending.append(executor.submit(function, task))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _pattern(words: Iterable[Text]) -> Pattern:
+    """Returns regex which finds any of the words as whole words."""
+    import re
+
+    alternation = []
+    for word in sorted(set(words), key=len, reverse=True):
+        # Only the edges made of word characters need boundaries, hence
+        # words like `?` are still found after a word.
+        start = r'(?<!\w)' if re.match(r'\w', word) else ''
+        end = r'(?!\w)' if re.match(r'\w', word[-1]) else ''
+        alternation.append(f'{start}{re.escape(word)}{end}')
+    return re.compile(f'({"|".join(alternation)})')
+
+
+def _variants(line: Text,
+              pattern: Pattern,
+              replace_words: List[Text],
+              variants: Optional[int],
+              random: Any) -> Iterator[Text]:
+    """Yields variants of the line with the words replaced."""
+    from itertools import product
+
+    parts = pattern.split(line)
+    found = len(parts) // 2
+    if not found:
+        yield line
+        return
+    literals = parts[::2]
+    total = len(replace_words) ** found
+    if variants is None or variants >= total:
+        combinations = product(replace_words, repeat=found)
+    else:
+        # Combinations are picked by their index, hence only the picked
+        # ones are ever built. Indexes are drawn one by one as the number
+        # of combinations can be too large for `random.sample`.
+        picked = {}
+        while len(picked) < variants:
+            picked.setdefault(random.randrange(total))
+        combinations = (_combination(idx, replace_words, found)
+                        for idx in picked)
+    for combination in combinations:
+        replaced = [literals[0]]
+        for word, literal in zip(combination, literals[1:]):
+            replaced.append(word)
+            replaced.append(literal)
+        yield ''.join(replaced)
+
+
+def _combination(idx: int, words: List[Text], size: int) -> List[Text]:
+    """Returns combination of the words at the index of their product."""
+    combination = []
+    for _ in range(size):
+        idx, digit = divmod(idx, len(words))
+        combination.append(words[digit])
+    return combination[::-1]
+
+
+def _replace_chunk(task: Tuple) -> List[Text]:
+    """Returns variants of the lines of the chunk."""
+    from random import Random
+
+    pattern, replace_words, variants, seed, lines = task
+    random = Random(seed)
+    return [variant for line in lines
+            for variant in _variants(line, pattern, replace_words,
+                                     variants, random)]
+
+
+def _shuffle(file: Text,
+             dst_file: IO,
+             dedupe: bool,
+             memory: int,
+             random: Any) -> None:
+    """Writes shuffled lines of the file to the destination file.
+
+    Files which do not fit in the memory budget are scattered into the
+    bucket files, which are then shuffled recursively.
+    """
+    from hashlib import blake2b
+    from math import ceil
+    from os import remove
+    from os.path import abspath, dirname, getsize, join
+    from tempfile import TemporaryDirectory
+
+    size = getsize(file)
+    # Lines take two to three times their size on the disk when held as
+    # strings, see `benchmarks/dataset.py`.
+    buckets = min(ceil(3 * size / memory), DATASET_FAN_IN)
+    if buckets <= 1:
+        with open(file, encoding=ENCODING,
+                  buffering=DATASET_BUFFER) as src_file:
+            lines = list(dict.fromkeys(_lines(src_file)) if dedupe
+                         else _lines(src_file))
+        random.shuffle(lines)
+        dst_file.writelines(lines)
+        return
+    # Every scatter uses a new salt, hence the lines of an oversized
+    # bucket are split apart when it is scattered again.
+    salt = random.getrandbits(64).to_bytes(8, 'little')
+    with TemporaryDirectory(dir=dirname(abspath(file))) as temp_dir:
+        paths = [join(temp_dir, f'{idx}.bucket') for idx in range(buckets)]
+        with ExitStack() as stack:
+            bucket_files = [stack.enter_context(open(path, 'w',
+                                                     encoding=ENCODING))
+                            for path in paths]
+            src_file = stack.enter_context(open(file, encoding=ENCODING,
+                                                buffering=DATASET_BUFFER))
+            for line in _lines(src_file):
+                if dedupe:
+                    digest = blake2b(line.encode(ENCODING), digest_size=8,
+                                     key=salt).digest()
+                    idx = int.from_bytes(digest, 'little') % buckets
+                else:
+                    idx = random.randrange(buckets)
+                bucket_files[idx].write(line)
+        for path in paths:
+            if dedupe and getsize(path) == size:
+                # Lines could not be split apart, i.e. they are copies of
+                # the same few lines which fit in the memory once dropped.
+                _shuffle(path, dst_file, dedupe, size * 3, random)
+            else:
+                _shuffle(path, dst_file, dedupe, memory, random)
+            remove(path)
+
+
+def _sections(lines: Iterable[Text]) -> Iterator[Tuple[bool, Iterator]]:
+    """Yields numbered lines of every section starting with `## `.
+
+    Every section is yielded along with True if it is an intent, i.e.
+    it starts with the `## intent:` header.
+    """
+    import re
+    from itertools import groupby
+
+    intent = re.compile(r'##\s*intent\s*:')
+    section = (0, False)
+
+    def _section(item: Tuple[int, Text]) -> Tuple[int, bool]:
+        """Returns number of the section of the line & it`s kind."""
+        nonlocal section
+        if item[1].startswith('## '):
+            section = (section[0] + 1, bool(intent.match(item[1])))
+        return section
+
+    for (_, is_intent), items in groupby(enumerate(lines), _section):
+        yield is_intent, items
+
+
+def sort_lines(file: Text,
+               dedupe: bool = True,
+               memory: Optional[int] = None) -> NoReturn:
     """Sorts lines in file.
 
-    file: File whose data needs to be sorted.
+    file:   File whose data needs to be sorted.
+    dedupe: If made False, the duplicate lines are kept.
+            Default: True
+    memory: Memory budget in bytes for holding the lines.
+            Default: None (`DATASET_MEMORY`)
 
     Sorts the lines in the file and saves it. This function is used to
-    debug any redundancies in the NLU data.
+    debug any redundancies in the NLU data. Files which do not fit in the
+    memory budget are sorted using external merge sort, i.e. the sorted
+    runs are spilled to the temporary files next to the file and are
+    merged back, dropping the duplicates while merging.
+
+    Note: The file is replaced only once it is completely written, hence
+    it is never left partially sorted.
     """
-    with open(file, encoding=ENCODING) as src_file:
-        new_list = sorted(set(src_file.readlines()))
-    with open(file, 'w', encoding=ENCODING) as src_file:
-        for line in new_list:
-            src_file.write(line)
+    from itertools import chain
+    from os import remove
+    from os.path import abspath, dirname, join
+    from tempfile import TemporaryDirectory
+
+    memory = memory or DATASET_MEMORY
+    with open(file, encoding=ENCODING, buffering=DATASET_BUFFER) as src_file, \
+            TemporaryDirectory(dir=dirname(abspath(file))) as temp_dir:
+        lines = _lines(src_file)
+        chunks = _chunks(lines, memory)
+        first = next(chunks, [])
+        # Only a single line is read ahead to know if the file fits in
+        # the memory budget, hence a second chunk is never held along
+        # with the first one.
+        ahead = next(lines, None)
+        chunks.close()
+        if ahead is None:
+            # Whole file fits in the memory budget.
+            first.sort()
+            with atomic_write(file, encoding=ENCODING,
+                              buffering=DATASET_BUFFER) as dst_file:
+                dst_file.writelines(_unique(first) if dedupe else first)
+            return
+        runs = []
+
+        def _spill(chunk: List[Text]) -> None:
+            """Sorts the chunk & writes it as a run."""
+            chunk.sort()
+            runs.append(join(temp_dir, f'{len(runs)}.run'))
+            with open(runs[-1], 'w', encoding=ENCODING,
+                      buffering=DATASET_BUFFER) as run_file:
+                run_file.writelines(_unique(chunk) if dedupe else chunk)
 
+        _spill(first)
+        # Every chunk is released before reading the next one.
+        del first
+        for chunk in _chunks(chain([ahead], lines), memory):
+            _spill(chunk)
+            del chunk
+        # Runs are merged in rounds, hence the number of files opened at
+        # once stays under `DATASET_FAN_IN`.
+        while len(runs) > DATASET_FAN_IN:
+            merged = []
+            for idx in range(0, len(runs), DATASET_FAN_IN):
+                merged.append(join(temp_dir, f'{len(runs)}-{idx}.run'))
+                with open(merged[-1], 'w', encoding=ENCODING,
+                          buffering=DATASET_BUFFER) as run_file:
+                    _merge(runs[idx:idx + DATASET_FAN_IN], run_file, dedupe)
+            for run in runs:
+                remove(run)
+            runs = merged
+        with atomic_write(file, encoding=ENCODING,
+                          buffering=DATASET_BUFFER) as dst_file:
+            _merge(runs, dst_file, dedupe)
 
-def randomize_lines(file: Text) -> NoReturn:
+
+def randomize_lines(file: Text,
+                    dedupe: Optional[bool] = False,
+                    memory: Optional[int] = None,
+                    seed: Optional[int] = None) -> NoReturn:
     """Randomizes lines.
 
-    file: File whose lines need to be randomized.
+    file:   File whose lines need to be randomized.
+    dedupe: If made True, the duplicate lines are dropped.
+            Default: False
+    memory: Memory budget in bytes for holding the lines.
+            Default: None (`DATASET_MEMORY`)
+    seed:   Seed of the shuffle. Same seed shuffles the same file in the
+            same order.
+            Default: None
 
     Randomizes the lines in the file. This function is used to make the
-    dataset slightly random.
+    dataset slightly random. Files which do not fit in the memory budget
+    are shuffled on the disk, i.e. the lines are scattered randomly into
+    the bucket files, every bucket is shuffled in the memory and the
+    buckets are joined back.
+
+    Note: While dropping the duplicates, the buckets are picked by hash
+    of the line instead, hence the duplicates always land in the same
+    bucket. Number of buckets is limited to `DATASET_FAN_IN`, hence the
+    buckets which still exceed the memory budget are shuffled on the
+    disk again, the same way.
     """
-    from random import shuffle
+    from random import Random
 
-    with open(file, encoding=ENCODING) as src_file:
-        new_list = list(set(src_file.readlines()))
-        shuffle(new_list)
-        src_file.close()
-    with open(file, 'w', encoding=ENCODING) as src_file:
-        for line in new_list:
-            src_file.write(line)
+    random = Random(seed)
+    with atomic_write(file, encoding=ENCODING,
+                      buffering=DATASET_BUFFER) as dst_file:
+        _shuffle(file, dst_file, dedupe, memory or DATASET_MEMORY, random)
 
 
 def replace_data(file: Text,
                  find_words: List,
-                 replace_words: List) -> NoReturn:
+                 replace_words: List,
+                 variants: Optional[int] = 1,
+                 seed: Optional[int] = None,
+                 workers: Optional[int] = None) -> NoReturn:
     """Replaces words or phrases.
 
     file:          File from which the words needs to be replaced.
     find_words:    List of words to be replaced from the opened file.
     replace_words: List of words to be replaced with in the opened file.
+    variants:      Number of variants written for every line which has
+                   the words, at least 1. If None, every combination of
+                   the replace words is written.
+                   Default: 1
+    seed:          Seed of the replacements. Same seed writes the same
+                   variants, irrespective of the number of workers.
+                   Default: None
+    workers:       Number of worker processes used for replacing.
+                   Default: None (Number of processors on the machine)
 
     Randomly replaces the given words in the file with required word and
-    saves it.
+    saves it. Every occurrence of the words in the line is replaced by
+    one of the replace words & the line is written once per variant.
+    The variants of the line are distinct combinations of the replace
+    words, picked randomly. Lines without the words are kept as they
+    are.
 
     Note: It is recommended to use this to replace the common words OR
-    patterns in your dataset.
+    patterns in your dataset. The words are found using a single regex,
+    hence longer words are preferred over their prefixes & the words are
+    matched only as whole words, for e.g: `hi` does not match `this`.
+    Empty strings can not be found, while they can replace the words.
     """
-    from random import choice
-
-    with open(file, encoding=ENCODING) as src_file:
-        lines = src_file.readlines()
-    with open(file, 'w', encoding=ENCODING) as src_file:
-        for line in lines:
-            if any(word in lines[line] for word in find_words):
-                replaced_line = lines[line].replace(choice(find_words),
-                                                    choice(replace_words))
-                src_file.write(replaced_line)
-            else:
-                src_file.write(lines[line])
+    from os.path import getsize
+
+    if not find_words or not replace_words:
+        raise ValueError('Words to be found & replaced can not be empty.')
+    if not all(find_words):
+        raise ValueError('Words to be found can not be empty strings.')
+    if variants is not None and variants < 1:
+        raise ValueError('Number of variants should be at least 1.')
+    pattern = _pattern(find_words)
+    replace_words = list(replace_words)
+    with open(file, encoding=ENCODING, buffering=DATASET_BUFFER) as src_file:
+        tasks = ((pattern, replace_words, variants,
+                  None if seed is None else f'{seed}:{idx}', chunk)
+                 for idx, chunk in enumerate(_batches(_lines(src_file),
+                                                      DATASET_CHUNK)))
+        # Spawning the workers would cost more than replacing the words
+        # in small files, hence they are replaced in this process.
+        if getsize(file) < DATASET_BUFFER:
+            workers = 1
+        with atomic_write(file, encoding=ENCODING,
+                          buffering=DATASET_BUFFER) as dst_file:
+            for lines in _imap(_replace_chunk, tasks, workers):
+                dst_file.writelines(lines)
 
 
-def delete_lines(file: Text, lines_to_retain: int = 1000) -> NoReturn:
+def delete_lines(file: Text,
+                 lines_to_retain: int = 1000,
+                 dedupe: bool = True,
+                 seed: Optional[int] = None,
+                 stratify: Optional[bool] = False) -> NoReturn:
     """Deletes lines randomly.
 
     file:            File from which the lines are to be deleted.
-    lines_to_retain: Number of lines to keep in the file.
+    lines_to_retain: Number of lines to keep in the file. If stratified,
+                     number of examples to keep under every intent.
                      Default: 1000
+    dedupe:          If made True, the duplicate lines (examples if
+                     stratified) are dropped while sampling.
+                     Default: True
+    seed:            Seed of the random sampling. Same seed retains the
+                     same lines of the same file.
+                     Default: None
+    stratify:        If made True, the examples (lines starting with
+                     `- `) are sampled separately under every intent
+                     header, like `## intent:greet`. Headers, rest of
+                     the lines & the other sections, like synonyms,
+                     regexes & lookups are kept as they are.
+                     Default: False
 
-    Randomly deletes lines from the file and saves it.
+    Randomly deletes lines from the file and saves it. The lines are
+    sampled without replacement using reservoir sampling in a single
+    pass, hence only the retained lines are held in the memory. Retained
+    lines are written in their original order.
 
     Note: It is recommended to use this function for shrinking the
-    dataset.
+    dataset. While dropping the duplicates, hashes of the lines seen are
+    held in the memory as well, hence the duplicates are never sampled.
     """
-    from random import choices, shuffle
-
-    with open(file, encoding=ENCODING) as src_file:
-        new_list = list(set(src_file.readlines()))
-        shuffle(new_list)
-    with open(file, 'w', encoding=ENCODING) as src_file:
-        if int(lines_to_retain) is None:
-            shrunked_list = choices(new_list, k=1000)
-        else:
-            shrunked_list = choices(new_list, k=int(lines_to_retain))
-        for line in shrunked_list:
-            src_file.write(line)
+    from heapq import merge
+    from random import Random
+
+    random = Random(seed)
+    lines_to_retain = int(lines_to_retain)
+    with open(file, encoding=ENCODING, buffering=DATASET_BUFFER) as src_file, \
+            atomic_write(file, encoding=ENCODING,
+                         buffering=DATASET_BUFFER) as dst_file:
+        if not stratify:
+            lines = enumerate(_lines(src_file))
+            sample = _reservoir(_distinct(lines) if dedupe else lines,
+                                lines_to_retain, random)
+            dst_file.writelines(line for _, line in sorted(sample))
+            return
+        for is_intent, section in _sections(_lines(src_file)):
+            if not is_intent:
+                dst_file.writelines(line for _, line in section)
+                continue
+            kept = []
+
+            def _examples() -> Iterator[Tuple[int, Text]]:
+                """Yields examples of the section, keeping the rest."""
+                for idx, line in section:
+                    if line.startswith('- '):
+                        yield idx, line
+                    else:
+                        kept.append((idx, line))
+
+            examples = _distinct(_examples()) if dedupe else _examples()
+            sample = sorted(_reservoir(examples, lines_to_retain, random))
+            dst_file.writelines(line for _, line in merge(kept, sample))
@@ -15,6 +15,9 @@ At a glance, the structure of the module is following:
                         is simply for the looks of output statement on
                         CMD.
  - quit():              Terminates the code with a confirmation.
+ - resolve_days():      Returns the name of the day after the given
+                        number of days from today. It is recommended to
+                        use this while replying with the forecasts.
  - find_string():       Finds the matching string in the list. This
                         function is similar to `find_file` function but
                         it needs to be used for searching file from
@@ -28,6 +31,10 @@ See https://github.com/xames3/charlotte for cloning the repository.
 #
 #   < Checkout my GitHub repo for history and latest stable build >
 #
+#   2.1.0 - Added `resolve_days` function which was missing after the
+#           rework.
+#           `find_string` now uses the matcher module instead of
+#           `fuzzywuzzy` & no longer scores the best match twice.
 #   2.0.0 - Reworked script.
 #           Removed `make_log` function.
 #           Removed `make_dir` & `find_file` and moved them to generic
@@ -84,6 +91,24 @@ def quit() -> NoReturn:
         exit()
 
 
+def resolve_days(days: Optional[int] = None) -> Text:
+    """Returns name of the day.
+
+    days: Number of days from today.
+          Default: None (Today)
+
+    Returns the name of the day after the given number of days from
+    today, i.e. `today`, `tomorrow` or the weekday name like `Friday`.
+    """
+    from datetime import date, timedelta
+
+    if not days:
+        return 'today'
+    if days == 1:
+        return 'tomorrow'
+    return (date.today() + timedelta(days=days)).strftime('%A')
+
+
 def find_string(string: Text,
                 string_list: List,
                 min_score: Optional[int] = 70) -> Text:
@@ -99,15 +124,11 @@ def find_string(string: Text,
     directory while `find_string` can be used for guessing text from any
     valid list like for ex. CSV columns.
     """
-    from fuzzywuzzy.fuzz import partial_ratio
-    from fuzzywuzzy.process import extract
-
-    # This will give us list of 3 best matches for our search query.
-    guessed = extract(string, string_list, limit=3, scorer=partial_ratio)
-    for best_guess in guessed:
-        # Finding the best match whose Levenshtein score is near to 100.
-        current_score = partial_ratio(string, best_guess)
-        if current_score > min_score and current_score > 0:
-            return best_guess[0]
-        else:
-            return f'Sorry, I could not find "{string}" in given list.'
+    from charlotte.utils.matcher import match
+
+    # Best match is scored only once & the choices which can not cross
+    # the minimum score are skipped early.
+    best = match(string, string_list, min_score)
+    if best:
+        return best[0]
+    return f'Sorry, I could not find "{string}" in given list.'
@@ -0,0 +1,115 @@
+"""
+The http module: Provides pooled HTTP sessions for the outbound calls.
+
+These functions help to reuse the TCP & TLS connections across the
+network calls. Every session keeps alive it`s connections with a limit
+on connections per host, uses connect & read timeouts and retries the
+failed calls with a backoff. Results of the calls also update the
+connectivity monitor, hence the connectivity rarely needs to be probed.
+
+At a glance, the structure of the module is following:
+ - session():           Returns the shared keep-alive session. It is
+                        recommended to pass this session to the third
+                        party clients which accept one, like googlemaps
+                        & geocoder.
+ - get():               Makes GET request using the shared session with
+                        the default timeouts. It is recommended to use
+                        this function instead of `requests.get` for
+                        every network call.
+
+See https://github.com/xames3/charlotte for cloning the repository.
+"""
+#   History:
+#
+#   < Checkout my GitHub repo for history and latest stable build >
+#
+#   2.1.0 - First code.
+
+from threading import Lock
+from typing import Any, Optional, Text, Tuple, Union
+
+from requests import ConnectionError, Response, Session
+from requests.exceptions import SSLError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from charlotte.utils.constants import (HTTP_BACKOFF, HTTP_POOL_SIZE,
+                                       HTTP_RETRIES, HTTP_TIMEOUT)
+
+_sessions = {}
+_lock = Lock()
+
+
+class _MonitoredAdapter(HTTPAdapter):
+    """Adapter which reports the results to the connectivity monitor."""
+
+    def send(self, *args: Any, **kwargs: Any) -> Response:
+        from charlotte.utils.system import connectivity
+
+        try:
+            response = super().send(*args, **kwargs)
+        except ConnectionError as error:
+            # Only the failed connections, including `ConnectTimeout` mean
+            # the network is down. Certificate errors & read timeouts are
+            # raised after reaching the host, hence they are not reported.
+            if error.response is None and not isinstance(error, SSLError):
+                connectivity().report(False)
+            raise
+        # Any response, even an error, means the network is reachable.
+        connectivity().report(True)
+        return response
+
+
+def session(retries: Optional[bool] = True) -> Session:
+    """Returns shared session.
+
+    retries: If made False, the failed calls are not retried. It is
+             recommended for the calls which need to fail fast.
+             Default: True
+
+    Returns the shared keep-alive session. Connections are pooled with
+    at most `HTTP_POOL_SIZE` connections per host. Failed connections &
+    responses with 429 or 5xx status codes are retried `HTTP_RETRIES`
+    times with backoff of `HTTP_BACKOFF` secs. Results of the calls
+    are reported to the connectivity monitor.
+
+    Note: The session is created once & is reused by every subsequent
+    call, hence it is safe to call this function for every request.
+    """
+    with _lock:
+        if retries not in _sessions:
+            retry = Retry(total=HTTP_RETRIES if retries else 0,
+                          backoff_factor=HTTP_BACKOFF,
+                          status_forcelist=(429, 500, 502, 503, 504),
+                          allowed_methods=('GET', 'HEAD'),
+                          raise_on_status=False)
+            adapter = _MonitoredAdapter(pool_connections=HTTP_POOL_SIZE,
+                                        pool_maxsize=HTTP_POOL_SIZE,
+                                        pool_block=True,
+                                        max_retries=retry)
+            new = Session()
+            new.mount('http://', adapter)
+            new.mount('https://', adapter)
+            _sessions[retries] = new
+        return _sessions[retries]
+
+
+def get(url: Text,
+        timeout: Optional[Union[float, Tuple[float, float]]] = None,
+        retries: Optional[bool] = True,
+        **kwargs: Any) -> Response:
+    """Makes GET request.
+
+    url:     URL to be requested.
+    timeout: Connect & read timeout in secs. A single value is used for
+             both of them.
+             Default: None (`HTTP_TIMEOUT`)
+    retries: If made False, the failed call is not retried.
+             Default: True
+    kwargs:  Rest of the arguments passed to `Session.get`.
+
+    Makes GET request using the shared session with the default
+    timeouts. Returns the response of the request.
+    """
+    return session(retries).get(url, timeout=timeout or HTTP_TIMEOUT,
+                                **kwargs)
@@ -0,0 +1,216 @@
+"""
+The matcher module: Provides fuzzy matching of the strings.
+
+These functions help to find the closest match of an approximate text
+in a list of strings, like file names, window titles or track names.
+Every fuzzy lookup of the project goes through this module, which uses
+the C-backed `rapidfuzz`.
+
+At a glance, the structure of the module is following:
+ - ChoiceSet():         Choices which are normalized once & reused by
+                        the repeated queries. The choices are reloaded
+                        only when their source changes.
+ - match():             Returns the best matching choice along with it`s
+                        score & index. Choices scoring below the minimum
+                        score are skipped early, hence most of them are
+                        never fully scored.
+ - match_many():        Returns the best matching choices for many
+                        queries. All the queries are scored against the
+                        choices in a single vectorized pass.
+
+See https://github.com/xames3/charlotte for cloning the repository.
+"""
+#   History:
+#
+#   < Checkout my GitHub repo for history and latest stable build >
+#
+#   2.1.0 - First code.
+
+from threading import Lock
+from typing import (Callable, Hashable, Iterable, List, Optional, Sequence,
+                    Text, Tuple, Union)
+
+from rapidfuzz import fuzz, process
+from rapidfuzz.utils import default_process
+
+Match = Tuple[Text, float, int]
+
+_MISSING = object()
+
+
+class ChoiceSet:
+    """Preprocessed choices for the repeated fuzzy queries.
+
+    source:    Choices or the function which returns the current choices,
+               like `active_windows`.
+    version:   Function which returns a token that changes whenever the
+               choices of the source change, like the modification time
+               of a directory. If None, the source is read on every query
+               but the choices are normalized again only if they differ.
+               Default: None
+    processor: Function which normalizes the queries & the choices.
+               Default: `default_process` (Lower case & alphanumerics)
+
+    Normalizes the choices once & keeps them till the source changes,
+    hence the repeated queries only normalize the query itself.
+
+    Note: Choice sets can be passed to `match`, `match_many` and to the
+    functions using them, like `find_string` & `find_file`.
+    """
+
+    def __init__(self,
+                 source: Union[Iterable[Text], Callable[[], Iterable[Text]]],
+                 version: Optional[Callable[[], Hashable]] = None,
+                 processor: Optional[Callable] = default_process) -> None:
+        self.processor = processor
+        self._source = source if callable(source) else None
+        self._version = version
+        self._token = _MISSING
+        self._lock = Lock()
+        self._choices: List[Text] = []
+        self._normalized: List[Text] = []
+        if self._source is None:
+            self.update(source)
+
+    def __len__(self) -> int:
+        return len(self.choices)
+
+    @property
+    def choices(self) -> List[Text]:
+        """Returns current choices."""
+        self.refresh()
+        return self._choices
+
+    def update(self, choices: Iterable[Text]) -> None:
+        """Replaces the choices, normalizing them only if they differ."""
+        choices = list(choices)
+        with self._lock:
+            if choices == self._choices and self._normalized:
+                return
+            normalized = [self.processor(choice) for choice in choices] \
+                if self.processor else choices
+            self._choices, self._normalized = choices, normalized
+
+    def refresh(self) -> None:
+        """Reloads the choices if the source has changed."""
+        if self._source is None:
+            return
+        if self._version is None:
+            self.update(self._source())
+            return
+        token = self._version()
+        if token != self._token:
+            self.update(self._source())
+            self._token = token
+
+    def _prepared(self) -> Tuple[List[Text], List[Text]]:
+        """Returns current choices along with the normalized ones."""
+        self.refresh()
+        with self._lock:
+            return self._choices, self._normalized
+
+    def match(self,
+              query: Text,
+              min_score: Optional[int] = 70,
+              scorer: Callable = fuzz.partial_ratio) -> Optional[Match]:
+        """Returns best match of the query, see `match`."""
+        choices, normalized = self._prepared()
+        query = self.processor(query) if self.processor else query
+        best = match(query, normalized, min_score, scorer, processor=None)
+        return (choices[best[2]], best[1], best[2]) if best else None
+
+    def match_many(self,
+                   queries: Sequence[Text],
+                   min_score: Optional[int] = 70,
+                   scorer: Callable = fuzz.partial_ratio,
+                   workers: int = -1) -> List[Optional[Match]]:
+        """Returns best matches of the queries, see `match_many`."""
+        choices, normalized = self._prepared()
+        if self.processor:
+            queries = [self.processor(query) for query in queries]
+        return [(choices[best[2]], best[1], best[2]) if best else None
+                for best in match_many(queries, normalized, min_score,
+                                       scorer, None, workers)]
+
+
+def match(query: Text,
+          choices: Sequence[Text],
+          min_score: Optional[int] = 70,
+          scorer: Callable = fuzz.partial_ratio,
+          processor: Optional[Callable] = default_process) -> Optional[Match]:
+    """Returns best match.
+
+    query:     Approximate text that you need to find from the choices.
+    choices:   Choices in which the text needs to be searched in, can be
+               a `ChoiceSet`.
+    min_score: Minimum score needed to make an approximate guess.
+               Default: 70
+    scorer:    Function which scores the query against a choice.
+               Default: `partial_ratio`
+    processor: Function which normalizes the query & the choices before
+               scoring. If None, they are scored as they are. Processor
+               of the choice set is used instead, if it is passed.
+               Default: `default_process` (Lower case & alphanumerics)
+
+    Returns the best matching choice along with it`s score & index. The
+    minimum score is passed to the scorer, hence choices which can not
+    cross it are skipped early. Returns None if no choice scores more
+    than the minimum score.
+    """
+    if isinstance(choices, ChoiceSet):
+        return choices.match(query, min_score, scorer)
+    best = process.extractOne(query, choices, scorer=scorer,
+                              processor=processor, score_cutoff=min_score)
+    if best and best[1] > min_score:
+        return best
+    return None
+
+
+def match_many(queries: Sequence[Text],
+               choices: Sequence[Text],
+               min_score: Optional[int] = 70,
+               scorer: Callable = fuzz.partial_ratio,
+               processor: Optional[Callable] = default_process,
+               workers: int = -1) -> List[Optional[Match]]:
+    """Returns best matches of many queries.
+
+    queries:   Approximate texts that you need to find from the choices.
+    choices:   Choices in which the texts need to be searched in, can be
+               a `ChoiceSet`.
+    min_score: Minimum score needed to make an approximate guess.
+               Default: 70
+    scorer:    Function which scores the query against a choice.
+               Default: `partial_ratio`
+    processor: Function which normalizes the queries & the choices
+               before scoring. If None, they are scored as they are.
+               Processor of the choice set is used instead, if it is
+               passed.
+               Default: `default_process` (Lower case & alphanumerics)
+    workers:   Number of threads used for scoring, -1 uses all cores.
+               Default: -1
+
+    Returns the best match of every query, in the order of the queries.
+    All the queries are scored against the choices in a single pass
+    using `cdist`.
+
+    Note: Unlike `match`, every choice is fully scored as the minimum
+    score is not raised while scoring. Hence this function is faster
+    than calling `match` in a loop only when the scoring is spread over
+    many cores, see `benchmarks/matcher.py`.
+    """
+    if isinstance(choices, ChoiceSet):
+        return choices.match_many(queries, min_score, scorer, workers)
+    if not queries:
+        return []
+    if not choices:
+        return [None] * len(queries)
+    scores = process.cdist(queries, choices, scorer=scorer,
+                           processor=processor, score_cutoff=min_score,
+                           workers=workers)
+    best = scores.argmax(axis=1)
+    matches = []
+    for row, idx in enumerate(best):
+        score = float(scores[row, idx])
+        matches.append((choices[idx], score, int(idx))
+                       if score > min_score else None)
+    return matches
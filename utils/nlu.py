@@ -0,0 +1,161 @@
+"""
+The nlu module: Provides parser for the NLU data written in Markdown.
+
+These functions help to read the intents, entities, synonyms & lookups
+from the `./data/nlu.md` file without importing Rasa. The file is read
+line by line & the parsed data is cached on the disk, hence the tools
+which need the NLU data start without parsing it again.
+
+At a glance, the structure of the module is following:
+ - parse_nlu():         Parses the `## intent:`, `## synonym:`,
+                        `## regex:` & `## lookup:` sections along with
+                        the `[text](entity:value)` annotations of the
+                        examples. Returns the parsed data as dictionary.
+ - load_nlu():          Returns the parsed data from the cache which is
+                        keyed by the hash of the file, hence the file is
+                        parsed again only if it`s content changes. It is
+                        recommended to use this function instead of
+                        `rasa.nlu.training_data.load_data` for reading
+                        the NLU data.
+ - nlu_entities():      Returns names of all the entities used in the
+                        examples of the parsed data.
+
+See https://github.com/xames3/charlotte for cloning the repository.
+"""
+#   History:
+#
+#   < Checkout my GitHub repo for history and latest stable build >
+#
+#   2.1.0 - First code.
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Text, Tuple
+
+from charlotte.utils.cache import LRUCache
+from charlotte.utils.constants import ENCODING
+from charlotte.utils.paths import files
+
+# Version of the parsed data, cached data of other versions is ignored.
+_VERSION = 1
+
+_parsed = None
+
+# You can find the reference of the syntax here:
+# https://legacy-docs.rasa.com/docs/nlu/dataformat/#markdown-format
+_HEADER = re.compile(r'##\s*(intent|synonym|regex|lookup)\s*:\s*(.+?)\s*$')
+_ITEM = re.compile(r'\s*[-*+]\s+(.*?)\s*$')
+_ENTITY = re.compile(r'\[(?P<text>[^\]]+)\]\((?P<entity>[^:)]+)'
+                     r'(?::(?P<value>[^)]+))?\)')
+
+
+def _example(text: Text) -> Tuple[Dict[Text, Any], Dict[Text, Text]]:
+    """Returns example without annotations & synonyms used in it."""
+    plain, entities, synonyms, last = [], [], {}, 0
+    offset = 0
+    for annotation in _ENTITY.finditer(text):
+        plain.append(text[last:annotation.start()])
+        offset += annotation.start() - last
+        value = annotation.group('text')
+        entity = {'start': offset,
+                  'end': offset + len(value),
+                  'value': annotation.group('value') or value,
+                  'entity': annotation.group('entity')}
+        if entity['value'] != value:
+            synonyms[value] = entity['value']
+        entities.append(entity)
+        plain.append(value)
+        offset += len(value)
+        last = annotation.end()
+    plain.append(text[last:])
+    return {'text': ''.join(plain), 'entities': entities}, synonyms
+
+
+def _append(group: Dict[Text, List], name: Text, text: Text) -> None:
+    """Appends text to the named list unless it is already present."""
+    texts = group.setdefault(name, [])
+    if text not in texts:
+        texts.append(text)
+
+
+def parse_nlu(lines: Iterable[Text]) -> Dict[Text, Any]:
+    """Parses NLU data.
+
+    lines: Lines of the NLU data written in Markdown, like an opened
+           `./data/nlu.md` file.
+
+    Parses the sections of the NLU data line by line. Returns dictionary
+    with the examples of every intent, along with the synonyms, regexes
+    & lookups keyed by their names. Entities of the examples are stored
+    with their position in the text without the annotations.
+
+    Note: Synonyms used in the annotations, like `[NY](place:new york)`
+    are added to the synonyms as well. Lookups stored in a file keep the
+    path of the file instead of the elements.
+    """
+    data = {'intents': {}, 'synonyms': {}, 'regexes': {}, 'lookups': {}}
+    section, name = None, None
+    for line in lines:
+        header = _HEADER.match(line)
+        if header:
+            section, name = header.groups()
+            if section == 'intent':
+                data['intents'].setdefault(name, [])
+            continue
+        if section is None or not line.strip() or \
+                line.lstrip().startswith('<!--'):
+            continue
+        item = _ITEM.match(line)
+        if item is None:
+            # Lookups can name a file which lists their elements.
+            if section == 'lookup':
+                data['lookups'][name] = line.strip()
+            continue
+        text = item.group(1)
+        if section == 'intent':
+            example, synonyms = _example(text)
+            data['intents'][name].append(example)
+            for synonym, value in synonyms.items():
+                _append(data['synonyms'], value, synonym)
+        elif section == 'synonym':
+            _append(data['synonyms'], name, text)
+        elif section == 'regex':
+            data['regexes'].setdefault(name, []).append(text)
+        elif isinstance(data['lookups'].setdefault(name, []), list):
+            data['lookups'][name].append(text)
+    return data
+
+
+def load_nlu(file: Optional[Text] = files['nlu']) -> Dict[Text, Any]:
+    """Returns parsed NLU data.
+
+    file: Path of the NLU data.
+          Default: `./data/nlu.md`
+
+    Returns the parsed NLU data, the same as `parse_nlu`. The cache is
+    keyed by the hash of the file, hence the file is parsed again only
+    if it`s content changes.
+
+    Note: Recently used entries are kept in the memory & all the entries
+    are backed by `./cache/nlu.db` file.
+    """
+    from hashlib import sha1
+
+    global _parsed
+    if _parsed is None:
+        _parsed = LRUCache(maxsize=16, file=files['nlu_cache'])
+    with open(file, 'rb') as src_file:
+        content = src_file.read()
+    key = (_VERSION, sha1(content).hexdigest())
+    data = _parsed.get(key)
+    if data is None:
+        data = parse_nlu(content.decode(ENCODING).splitlines())
+        _parsed.set(key, data)
+    return data
+
+
+def nlu_entities(data: Dict[Text, Any]) -> Set[Text]:
+    """Returns names of the entities used in the examples."""
+    return {entity['entity']
+            for examples in data['intents'].values()
+            for example in examples
+            for entity in example['entities']}
@@ -12,6 +12,10 @@ See https://github.com/xames3/charlotte for cloning the repository.
 #
 #   < Checkout my GitHub repo for history and latest stable build >
 #
+#   2.1.0 - Added paths for the music library index & local music
+#           directory.
+#           Added paths for the metadata & geocode caches.
+#           Added path for the parsed NLU data cache.
 #   2.0.0 - Merged directories.py and files.py into single file.
 #           Removed "_drives" function and moved it to system module.
 #   1.1.1 - Improved the type hints by using the typing module.
@@ -28,6 +32,7 @@ root = {
     'cache': PARENT/'cache/',
     'core': PARENT/'core/',
     'data': PARENT/'data/',
+    'csv': PARENT/'data/knowledge/csv/',
     'stories': PARENT/'data/stories/',
     'lookups': PARENT/'data/lookups/',
     'database': PARENT/'database/',
@@ -47,4 +52,13 @@ files = {
     'credentials': PARENT/'credentials.yml',
     'domain': PARENT/'domain.yml',
     'endpoints': PARENT/'endpoints.yml',
+    'music': PARENT/'data/knowledge/csv/music.csv',
+    'library': PARENT/'database/library.db',
+    'tags': PARENT/'cache/tags.db',
+    'geocodes': PARENT/'cache/geocodes.db',
+    'nlu_cache': PARENT/'cache/nlu.db',
+}
+
+local = {
+    'music': Path.home()/'Music/',
 }
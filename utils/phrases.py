@@ -1,7 +1,9 @@
 """
 The phrases module: Replies with responses at inference.
 
-This module is built for returning replies for particular task.
+This module is built for returning replies for particular task. All the
+replies are registered as templates in `replies`, hence only the reply
+which is selected is rendered.
 
 See https://github.com/xames3/charlotte for cloning the repository.
 """
@@ -9,6 +11,9 @@ See https://github.com/xames3/charlotte for cloning the repository.
 #
 #   < Checkout my GitHub repo for history and latest stable build >
 #
+#   2.1.0 - Added `forecast` & `music` templates, which were formatted
+#           in the weather & music modules.
+#           Added `replies`, the registry of all the templates.
 #   2.0.0 - Reworked script.
 #   1.1.2 - Added example value to `yes_boss` key.
 #   1.1.1 - Made the code more* PEP-8 compliant.
@@ -24,6 +29,7 @@ See https://github.com/xames3/charlotte for cloning the repository.
 #   1.0.0 - First code.
 
 from charlotte.utils.constants import NAME, USER
+from charlotte.utils.templates import Templates
 
 TITLE = USER.capitalize()
 
@@ -108,3 +114,98 @@ weather = {
               'Retrying...'],
     'still': [f'{TITLE}, I\'m still not able to access the  internet.',
               f'We still don\'t have an active internet connection, {USER}.']}
+
+# For weather forecast replies.
+forecast = {
+    'days': ['For the next {days} {pl} there are some places in '
+             '{loc} that will be {cond}. Interestingly, there would '
+             'be {fore}',
+             'Well it does look as if we\'ll see more {cond} across '
+             '{loc} for the next {days} {pl}. More so there will be '
+             '{fore}',
+             'Some parts of {loc} will be seeing a bit of {cond} for '
+             'the next {days} {pl} with average temperature of {feel}'
+             '. But for the most part it\'ll fluctuate between {max} '
+             'high & {min} low.',
+             'Well for the next {days} {pl}, it seems it\'ll be '
+             'fairly {cond} in some parts of {loc}. Winds can be '
+             'seen gushing at speeds upto {spd} and as we go '
+             'through the week the temperature will vary between '
+             '{max} high & {min} low.',
+             'I could see some {sky} skies over {dir} parts of {loc} '
+             'for the next {days} {pl}. Also we do have some {cond} '
+             'spells with the temperature struggling to be '
+             'about {temp}.',
+             'For {day} it is forecasted that there are some places '
+             'in {loc} that will be {cond}. Interestingly, there '
+             'would be {fore}',
+             'Some parts of {loc} will be seeing a bit of {cond} by '
+             '{day} with average temperature of {feel}. But for the '
+             'most part it\'ll fluctuate between {max} high & '
+             '{min} low.',
+             'Well till {day}, it seems it\'ll be fairly {cond} in '
+             'some parts of {loc}. Winds can be seen gushing at '
+             'speeds upto {spd} and as we go through the week the '
+             'temperature will vary between {max} high & {min} low.'],
+    'hours': ['We are going to see {cond} in the next {hours} hours '
+              'with {sky} skies in some parts {loc} with temperature '
+              'fluctuating between {max} high & {min} low.',
+              'There is going to be {cond} here in {loc} for the next '
+              '{hours} hours, also we may experience {sky} skies with '
+              'temperatures spiking upto {temp}.'],
+    'now': ['Well, it is {cond} in some places across much of {loc}. '
+            'Having said that the temperature has been around {temp} '
+            'roughly and will stay the same for the most part of the '
+            '{part}.',
+            'It is {cond} in {dir} parts of {loc}. We will however '
+            'see the temperature between {min} & {max}. '
+            'Interestingly, there would be {fore}',
+            'It is {cond} across {dir} {loc} especially in the early '
+            'hours. It\'s the expected humidity of {hum} with the '
+            'unsettling breeze is affecting the average temperature '
+            'of {feel}.',
+            'Looking at {loc} from above, it is {cond}. While some '
+            'of the areas in {dir} {loc} would get as low as {min} '
+            '& as high as {max} because of the humidity.',
+            'Well from above here, it seems it is {cond}. Winds can '
+            'be seen gushing at speeds upto {spd} across {loc} and '
+            'as we go throughout the {part} the temperature will'
+            ' vary between {max} high & {min} low.',
+            'Most likely it is {cond}. However, we could see '
+            'temperature rise upto {temp} over the grounds of {dir} '
+            'parts of {loc}. Interestingly, there would be {fore}',
+            'In the {part} we shall witness {cond} in places across '
+            '{loc}. It\'s a fine start to the {part} but we\'ve got '
+            'some windy weather which should feel relatively pleasant '
+            'with the temperature slightly above {temp}.',
+            'The temperature in {loc} is going to stay between '
+            '{temp} & {feel} all {part} with a bit of {cond} in the '
+            '{dir} parts. However, it\'ll be {fore}']}
+
+# For music replies.
+music = {
+    'file': ['Alright, playing {file_name}.',
+             'Alright {user}, playing {file_name}.',
+             'Sure, playing {file_name}.', 'Okay, playing {file_name}.',
+             'Right on it, {user}.', 'Here you go...', 'Okay...'],
+    'track': ['Alright, playing {track_name}.',
+              'Alright {user}, playing {track_name}.',
+              'Sure, playing {track_name}.', 'Okay, playing {track_name}.',
+              'Right on it, {user}.', 'Here you go...', 'Okay...'],
+    'both': ['Alright, playing {track_name} by {track_artist}.',
+             'Alright, playing {track_name}.',
+             'Alright {user}, playing {track_name}.',
+             'Sure, playing {track_name} by {track_artist}.',
+             'Okay, playing {track_name} by {track_artist}.',
+             'Right on it, {user}.', 'Okay...'],
+    'missing': ['Sorry {user}. I could not find any track with the search '
+                'parameters.',
+                'Sorry {user}. I could not find any match for the playing '
+                'track.'],
+    'empty': ['Sorry {user}. There is no track to play.']}
+
+# For rendering the replies. Every dictionary above is registered as the
+# groups of templates, for e.g: `weather.wait` or `forecast.now`.
+replies = Templates(defaults={'name': NAME, 'title': TITLE, 'user': USER})
+replies.update(cmd=cmd, greet=greet, errors=errors, weather=weather,
+               forecast=forecast, music=music)
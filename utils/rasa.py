@@ -35,6 +35,9 @@ See https://github.com/xames3/charlotte for complete documentation.
 #
 #   < Checkout my GitHub repo for history and latest stable build >
 #
+#   2.1.0 - Prompts are now rendered using the `replies` templates.
+#           `get_nlu_stats` now reads the NLU data using the nlu module
+#           instead of loading it using Rasa.
 #   2.0.0 - Removed redundant functions.
 #   1.1.1 - Improved the type hints by using the typing module.
 #           Made the code more* PEP-8 compliant.
@@ -53,14 +56,13 @@ See https://github.com/xames3/charlotte for complete documentation.
 #   1.0.1 - Added reference links to the functions.
 #   1.0.0 - First code.
 
-from random import choice
 from subprocess import call
 from typing import NoReturn, Optional, Text
 
 from charlotte.utils.inquiry import answer, choose, confirm
 from charlotte.utils.generic import show
 from charlotte.utils.paths import root, files
-from charlotte.utils.phrases import NAME, TITLE, USER, cmd
+from charlotte.utils.phrases import NAME, TITLE, USER, replies
 from charlotte.utils.system import make_dir
 
 
@@ -125,11 +127,12 @@ def render_model() -> NoReturn:
     # You can find the reference code here:
     # https://rasa.com/docs/rasa/user-guide/command-line-interface/
     # Asks which model to render.
-    type = choose(choice(cmd['choose']), nlu='NLU', core='Core', both='Both')
+    type = choose(replies.render('cmd.choose'), nlu='NLU', core='Core',
+                  both='Both')
     # Builds domain file with the my details.
     build_domain()
     make_dir(root['models'])
-    rename = confirm(choice(cmd['rename']))
+    rename = confirm(replies.render('cmd.rename'))
     name = answer('What would you like to call it?') if rename else NAME
     # Appending model type to the name.
     if type == 'nlu':
@@ -179,25 +182,25 @@ def get_nlu_stats() -> NoReturn:
     Note: It is recommended to use this function for checking new
     intents & entities.
     """
-    from tempfile import TemporaryFile
-    from rasa.nlu.training_data import load_data
+    from tempfile import NamedTemporaryFile
     from charlotte.utils.constants import ENCODING
+    from charlotte.utils.nlu import load_nlu, nlu_entities
 
     make_dir(root['temp'])
-    # Loads NLU data from `./data/nlu.md` file.
-    nlu_data = load_data(str(files['nlu']))
+    # Loads NLU data from `./data/nlu.md` file without importing Rasa.
+    nlu_data = load_nlu(files['nlu'])
     # Creates set of present intents and entities in the NLU data.
-    intents = [nlu_data.intents][0]
-    entities = [nlu_data.entities][0]
+    intents = sorted(nlu_data['intents'])
+    entities = sorted(nlu_entities(nlu_data))
     # Creates a temporary file in `./files/temp/` directory.
     # The created temporary file does not auto delete.
-    named_temp_file = TemporaryFile(dir=root['temp'], delete=False)
-    # Creates a list of all the intents and entities using the sets.
-    with open(named_temp_file.name, 'w', encoding=ENCODING) as temp_file:
+    with NamedTemporaryFile('w', dir=root['temp'], delete=False,
+                            encoding=ENCODING) as temp_file:
+        # Creates a list of all the intents and entities using the sets.
         temp_file.write('Intents:\n')
         for index in intents:
             temp_file.write(index + '\n')
         temp_file.write('\nEntities:\n')
         for index in entities:
             temp_file.write(index + '\n')
-    show(f'Done. Results are stored in {named_temp_file.name} file.')
+    show(f'Done. Results are stored in {temp_file.name} file.')
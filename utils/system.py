@@ -10,6 +10,10 @@ At a glance, the structure of the module is following:
                         code. Works like `mkdir`, except that any
                         intermediate path segment will be created if it
                         does not exist.
+ - atomic_write():      Opens a temporary file which replaces the target
+                        file only once it is completely written. Hence
+                        the readers never see a missing or partially
+                        written file.
  - profiler():          A decorator that uses cProfile to profile a
                         function. This function is essentially developed
                         to test & optimise other functions. The
@@ -20,17 +24,27 @@ At a glance, the structure of the module is following:
                         with `minimize_window`.
  - minimize_window():   Minimizes active window frame. It is recommended
                         to use when the process starts & needs to be
-                        minimized.
+                        minimized. The window is minimized as soon as it
+                        appears, optionally waiting on a background
+                        thread.
+ - ConnectivityMonitor(): Caches the last known state of the internet
+                        connection. The state is updated passively by
+                        the network calls & by a cheap connect-only
+                        probe made in background.
+ - connectivity():      Returns the shared connectivity monitor.
  - check_internet():    Checks the internet connectivity of the system.
                         If the internet connection is available, it
                         returns True else False. It is recommended to
                         use to this function where internet connection
                         is required.
+ - DirectorySnapshot(): Cached listing of the files of a directory. It
+                        is refreshed only when the directory changes &
+                        picks random files in constant time.
+ - snapshot():          Returns the shared snapshot of the directory.
  - find_file():         Finds the matching file in the directory. This
                         function uses Fuzzy Logic for determining the
-                        best possible match. Function can provide 3 best
-                        possible matches but we use just 1 i.e. The best
-                        match.
+                        best possible match. Returns the best match
+                        along with it`s score.
  - get_drives():        Returns the drive letter from all the valid &
                         present partitions. This assures that the user
                         does not use any drive letter which is not
@@ -42,6 +56,21 @@ See https://github.com/xames3/charlotte for cloning the repository.
 #
 #   < Checkout my GitHub repo for history & latest stable build >
 #
+#   2.1.0 - Added `atomic_write` function.
+#           Added `ConnectivityMonitor`. `check_internet` now returns the
+#           cached state of the monitor instead of requesting Google on
+#           every call.
+#           `find_file` now uses the matcher module & returns the score
+#           of the match along with the file.
+#           `active_windows` & `minimize_window` now use the window
+#           manager of the windows module. `minimize_window` waits for
+#           the window to appear with a timeout instead of sleeping.
+#           Added `DirectorySnapshot`. `find_file` now accepts the
+#           directory & matches against it`s snapshot.
+#           `minimize_window` can wait for the window on a background
+#           thread.
+#           Added `ConnectivityMonitor.failing`, which tells if the real
+#           network calls are failing, irrespective of the probe.
 #   2.0.0 - Reworked script.
 #           Removed `resolve_days` func. & moved it to generic module.
 #           Added `make_dir` & `find_file` from generic module.
@@ -53,11 +82,16 @@ See https://github.com/xames3/charlotte for cloning the repository.
 #           connection.
 #   1.0.0 - First code.
 
-from typing import Any, Callable, List, NoReturn, Optional, Text, Union, Tuple
+from contextlib import contextmanager
+from typing import (Any, Callable, IO, Iterator, List, NoReturn, Optional,
+                    Text, Union, Tuple)
 
-from charlotte.utils.generic import find_string
 from charlotte.utils.paths import files
 
+_monitor = None
+
+_snapshots = {}
+
 
 def make_dir(name: Text, init: Optional[bool] = False) -> NoReturn:
     """Creates directory.
@@ -84,6 +118,54 @@ def make_dir(name: Text, init: Optional[bool] = False) -> NoReturn:
             init.close()
 
 
+@contextmanager
+def atomic_write(file: Text,
+                 mode: Text = 'w',
+                 **kwargs: Any) -> Iterator[IO]:
+    """Writes file atomically.
+
+    file:   File which needs to be written.
+    mode:   Mode in which the file is opened, `w` or `wb`.
+            Default: w
+    kwargs: Rest of the arguments passed to `open`, like encoding.
+
+    Opens a temporary file next to the target file which replaces the
+    target file only once it is completely written. Hence the readers
+    never see a missing or partially written file.
+
+    Note: If an exception is raised while writing, the temporary file is
+    deleted & the target file is left untouched.
+    """
+    from os import O_CREAT, O_EXCL, O_WRONLY
+    from os import open as open_fd
+    from os import remove, replace
+    from os.path import abspath, basename, dirname, exists, join
+    from secrets import token_hex
+    from shutil import copymode
+
+    make_dir(dirname(abspath(file)))
+    # Temporary file is created with the default permissions, hence the
+    # umask is applied by the kernel, like the files made by `open`.
+    while True:
+        temp = join(dirname(abspath(file)),
+                    f'.{basename(file)}.{token_hex(4)}.tmp')
+        try:
+            handle = open_fd(temp, O_CREAT | O_EXCL | O_WRONLY, 0o666)
+            break
+        except FileExistsError:
+            continue
+    try:
+        with open(handle, mode, **kwargs) as temp_file:
+            yield temp_file
+        # Permissions of the existing target file are retained.
+        if exists(file):
+            copymode(file, temp)
+        replace(temp, file)
+    except BaseException:
+        remove(temp)
+        raise
+
+
 def profiler(function: Callable) -> Any:
     """Profiling & optimizing decorator.
 
@@ -120,104 +202,327 @@ def profiler(function: Callable) -> Any:
 def active_windows() -> List:
     """Returns list of active windows.
 
-    Lists all currently active windows.
+    Lists all currently active windows. Titles are cached by the window
+    manager for `WINDOW_TTL` seconds.
 
     Note: It is recommended to use this function in conjunction with
     `minimize_window`.
     """
-    # You can find the reference code here:
-    # https://sjohannes.wordpress.com/2012/03/23/win32-python-getting-
-    # all-window-titles/
-    import ctypes
-
-    EnumWindowsProc = ctypes.WINFUNCTYPE(ctypes.c_bool,
-                                         ctypes.POINTER(ctypes.c_int),
-                                         ctypes.POINTER(ctypes.c_int))
-    titles = []
-
-    def _each_window(hwnd: Any, lParam: Any) -> bool:
-        """Function which pulls boolean status of each active window."""
-        if ctypes.windll.user32.IsWindowVisible(hwnd):
-            length = ctypes.windll.user32.GetWindowTextLengthW(hwnd)
-            buff = ctypes.create_unicode_buffer(length + 1)
-            ctypes.windll.user32.GetWindowTextW(hwnd, buff, length + 1)
-            # Creating list of windows.
-            titles.append(buff.value)
-            titles
-        return True
-
-    # Listing all the active windows, includes windows which has no name
-    # too.
-    ctypes.windll.user32.EnumWindows(EnumWindowsProc(_each_window), 0)
-    # Returns list of only active windows with title names.
-    return list(filter(None, titles))
+    from charlotte.utils.windows import window_manager
+
+    return window_manager().titles()
 
 
 def minimize_window(window_name: Text,
-                    delay: Union[float, int] = 1.0) -> NoReturn:
+                    timeout: Optional[Union[float, int]] = None,
+                    background: Optional[bool] = False) -> Optional[bool]:
     """Minimizes active window.
 
     window_name: Name of the window that needs to be minimize.
                  The name can be fuzzy.
-    delay:       Delay with which the window should be minimized.
-                 Default: 1.0 sec.
+    timeout:     Seconds for which the window is waited for, if it has
+                 not appeared yet.
+                 Default: None (`WINDOW_TIMEOUT`)
+    background:  If made True, the window is waited for on a background
+                 thread & None is returned right away.
+                 Default: False
+
+    Minimizes the window as soon as it appears instead of waiting for a
+    fixed delay. Returns False if the window does not appear before the
+    timeout.
 
     Note: It is recommended to use when the process starts and needs to
-    be minimized.
+    be minimized. Use `background` while serving a request, hence the
+    request is not held up if the window never appears.
+    """
+    from threading import Thread
+
+    from charlotte.utils.constants import WINDOW_TIMEOUT
+    from charlotte.utils.windows import window_manager
+
+    if background:
+        Thread(target=window_manager().minimize,
+               args=(window_name, timeout or WINDOW_TIMEOUT),
+               daemon=True).start()
+        return None
+    return window_manager().minimize(window_name, timeout or WINDOW_TIMEOUT)
+
+
+class ConnectivityMonitor:
+    """Connectivity monitor.
+
+    endpoint: Host & port which is connected to for probing the
+              connectivity. A local endpoint can be used for testing it
+              offline.
+              Default: `CONNECTIVITY_ENDPOINT`
+    ttl:      Seconds for which the last known state is trusted.
+              Default: `CONNECTIVITY_TTL`
+    timeout:  Seconds after which the probe gives up connecting.
+              Default: `CONNECTIVITY_TIMEOUT`
+    interval: Seconds between the probes made in background.
+              Default: `CONNECTIVITY_INTERVAL`
+
+    Caches the last known state of the internet connection. The state
+    is updated passively by the results of the network calls made using
+    the http module & by probing the endpoint in background. The probe
+    only opens a TCP connection, hence it is much cheaper than a request.
+
+    Note: If the state is older than `ttl`, it is probed right away
+    before it is returned.
     """
-    # You can find the reference code here:
-    # https://stackoverflow.com/questions/25466795/how-to-minimize-a-
-    # specific-window-in-python?noredirect=1&lq=1
-    from time import sleep
-    from win32con import SW_MINIMIZE
-    from win32gui import FindWindow, ShowWindow
 
-    sleep(delay) if delay else sleep(1.0)
-    # Minimizes window using the `find_string` function (fuzzy match).
-    ShowWindow(FindWindow(None, find_string(window_name, active_windows())),
-               SW_MINIMIZE)
+    def __init__(self,
+                 endpoint: Optional[Tuple[Text, int]] = None,
+                 ttl: Optional[Union[float, int]] = None,
+                 timeout: Optional[Union[float, int]] = None,
+                 interval: Optional[Union[float, int]] = None) -> None:
+        from threading import Event, Lock
+        from charlotte.utils.constants import (CONNECTIVITY_ENDPOINT,
+                                               CONNECTIVITY_INTERVAL,
+                                               CONNECTIVITY_TIMEOUT,
+                                               CONNECTIVITY_TTL)
+
+        self.endpoint = endpoint or CONNECTIVITY_ENDPOINT
+        self.ttl = CONNECTIVITY_TTL if ttl is None else ttl
+        self.timeout = CONNECTIVITY_TIMEOUT if timeout is None else timeout
+        self.interval = CONNECTIVITY_INTERVAL if interval is None \
+            else interval
+        self._online = None
+        self._probed = False
+        self._updated = 0.0
+        self._lock = Lock()
+        self._stopped = Event()
+        self._thread = None
+
+    @property
+    def online(self) -> Optional[bool]:
+        """Returns last known state, None if it is not known yet."""
+        return self._online
+
+    @property
+    def age(self) -> float:
+        """Returns seconds since the state was last updated."""
+        from time import monotonic
+
+        return monotonic() - self._updated
+
+    def report(self, online: bool, probed: bool = False) -> None:
+        """Updates the state with the result of a network call."""
+        from time import monotonic
+
+        with self._lock:
+            self._online = online
+            self._probed = probed
+            self._updated = monotonic()
+
+    def failing(self) -> bool:
+        """Returns True if the last network call could not connect.
+
+        Only the real network calls are considered, as the probe can be
+        blocked by a firewall even if the network is reachable. Failures
+        older than `ttl` are ignored.
+        """
+        with self._lock:
+            return self._online is False and not self._probed and \
+                self.age < self.ttl
+
+    def probe(self, timeout: Optional[Union[float, int]] = None) -> bool:
+        """Connects to the endpoint & updates the state."""
+        from socket import create_connection
+
+        try:
+            create_connection(self.endpoint,
+                              timeout or self.timeout).close()
+            online = True
+        except OSError:
+            online = False
+        self.report(online, probed=True)
+        return online
+
+    def check(self,
+              timeout: Optional[Union[float, int]] = None,
+              force: Optional[bool] = False) -> bool:
+        """Returns state of the internet connection.
+
+        timeout: Seconds after which the probe gives up connecting.
+                 Default: None (`timeout` of the monitor)
+        force:   If made True, the endpoint is probed even if the last
+                 known state is fresh.
+                 Default: False
+        """
+        if force or self._online is None or self.age >= self.ttl:
+            return self.probe(timeout)
+        return self._online
+
+    def start(self) -> 'ConnectivityMonitor':
+        """Starts probing the endpoint in background."""
+        from threading import Thread
+
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped.clear()
+            self._thread = Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops probing the endpoint in background."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        """Probes the endpoint unless a network call updated the state."""
+        while not self._stopped.is_set():
+            if self.age >= self.interval:
+                self.probe()
+            self._stopped.wait(max(self.interval - self.age, 0.1))
+
+
+def connectivity() -> ConnectivityMonitor:
+    """Returns connectivity monitor.
+
+    Returns the connectivity monitor shared by the http module & the
+    `check_internet` function. The background probe is started on the
+    first call.
+    """
+    global _monitor
+    if _monitor is None:
+        _monitor = ConnectivityMonitor().start()
+    return _monitor
 
 
-def check_internet(timeout: Optional[Union[float, int]] = 10.0) -> bool:
+def check_internet(timeout: Optional[Union[float, int]] = None,
+                   force: Optional[bool] = False) -> bool:
     """Checks the internet.
 
     timeout: Time in seconds before the function sends response if the
              internet is available or not.
-             Default: 10.0 secs.
+             Default: None (`CONNECTIVITY_TIMEOUT`)
+    force:   If made True, the connectivity is probed even if the last
+             known state is fresh.
+             Default: False
 
     Checks the internet connectivity of the system. Returns True if the
     internet connection is available, else False.
 
     Note: It is recommended to use to this function where internet
-    connection is required.
+    connection is required. The last known state of the connectivity
+    monitor is returned, hence most of the calls do not touch the
+    network at all.
     """
-    # You can find the reference code here:
-    # https://gist.github.com/yasinkuyu/aa505c1f4bbb4016281d7167b8fa2fc2
-    from requests import ConnectionError, get
+    return connectivity().check(timeout, force)
 
-    url = 'https://www.google.com/'
-    try:
-        _ = get(url, timeout=timeout)
-        return True
-    except ConnectionError:
-        return False
 
+class DirectorySnapshot:
+    """Cached listing of the files of a directory.
+
+    path: Directory whose files need to be listed.
+
+    Lists the files using `os.scandir`, which reuses the type of the
+    entries returned by the directory listing instead of calling `stat`
+    for every file. The listing is read again only when the modification
+    time of the directory changes, i.e. when files are added, removed or
+    renamed.
+
+    Note: Files of the sub-directories are not listed. Choices of the
+    snapshot can be passed directly to the fuzzy matchers.
+    """
 
-def find_file(file: Text, dir_name: List) -> Tuple[Text, int]:
+    def __init__(self, path: Text) -> None:
+        from threading import Lock
+        from charlotte.utils.matcher import ChoiceSet
+
+        self.path = str(path)
+        self._mtime = None
+        self._names: List[Text] = []
+        self._paths: List[Text] = []
+        self._lock = Lock()
+        self.choices = ChoiceSet(lambda: self._names, version=self.version)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def version(self) -> int:
+        """Refreshes the listing & returns it`s modification time."""
+        from os import scandir, stat
+
+        mtime = stat(self.path).st_mtime_ns
+        with self._lock:
+            if mtime != self._mtime:
+                with scandir(self.path) as entries:
+                    files = [(entry.name, entry.path) for entry in entries
+                             if entry.is_file()]
+                self._names = [name for name, _ in files]
+                self._paths = [path for _, path in files]
+                self._mtime = mtime
+        return mtime
+
+    @property
+    def names(self) -> List[Text]:
+        """Returns names of the files."""
+        self.version()
+        return self._names
+
+    @property
+    def paths(self) -> List[Text]:
+        """Returns paths of the files."""
+        self.version()
+        return self._paths
+
+    def random(self) -> Optional[Text]:
+        """Returns path of a random file, None if there are no files."""
+        from random import choice
+
+        paths = self.paths
+        return choice(paths) if paths else None
+
+
+def snapshot(path: Text) -> DirectorySnapshot:
+    """Returns directory snapshot.
+
+    path: Directory whose files need to be listed.
+
+    Returns the cached listing of the directory. The snapshot is created
+    once per directory & is reused by every subsequent call.
+    """
+    from os.path import abspath
+
+    key = abspath(str(path))
+    if key not in _snapshots:
+        _snapshots[key] = DirectorySnapshot(key)
+    return _snapshots[key]
+
+
+def find_file(file: Text,
+              dir_name: Union[Text, List],
+              min_score: Optional[int] = 70) -> Tuple[Text, int]:
     """Finds file in directory.
 
     file:      Approx. name of the file to search in the directory.
-    dir_name:  Directory in which the file needs to be searched in.
-    
+    dir_name:  Directory in which the file needs to be searched in, or
+               the files of it.
+    min_score: Minimum score needed to make an approximate guess.
+               Default: 70
+
     Finds the matching file in the directory. This function uses Fuzzy
-    Logic for determining the best possible match.
+    Logic for determining the best possible match. Returns the name of
+    the file along with it`s score.
 
-    Note: Function can provide 3 best possible matches but we use just 1
-    i.e. The best match.
+    Note: If no file scores more than the minimum score, a reply along
+    with score of 0 is returned. Directories are listed using their
+    snapshot, hence the files are not listed again till the directory
+    changes.
     """
-    from rapidfuzz import fuzz, process
-  
-    return process.extractOne(file, dir_name, scorer=fuzz.partial_ratio)[0]
+    from os import PathLike
+    from charlotte.utils.matcher import match
+
+    if isinstance(dir_name, (str, PathLike)):
+        dir_name = snapshot(dir_name).choices
+    best = match(file, dir_name, min_score)
+    if best:
+        return best[0], best[1]
+    return f'Sorry, I could not find "{file}" in given directory.', 0
 
 
 def get_drives(drive_letter: Text) -> Text:
@@ -0,0 +1,152 @@
+"""
+The templates module: Provides precompiled templates for the replies.
+
+These templates help to render the replies without formatting every
+variant of it. The templates are parsed once when they are registered &
+only the selected template is rendered.
+
+At a glance, the structure of the module is following:
+ - Template():          Reply template which is parsed once using the
+                        `string.Formatter`. It knows the fields it needs
+                        & renders them without parsing the text again.
+ - Templates():         Registry of the reply templates. Templates are
+                        registered in groups, like `weather.wait`. While
+                        rendering, the fields needed by every template
+                        of the group are checked before one of them is
+                        selected, hence the missing values fail early.
+
+See https://github.com/xames3/charlotte for cloning the repository.
+"""
+#   History:
+#
+#   < Checkout my GitHub repo for history and latest stable build >
+#
+#   2.1.0 - First code.
+
+from random import choice
+from string import Formatter
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Text
+
+_formatter = Formatter()
+
+
+class Template:
+    """Precompiled reply template.
+
+    text: Text of the template. Fields are written like the `str.format`
+          fields, for e.g: `Playing {track_name}.`
+
+    Parses the text once into literal parts & fields. Rendering joins the
+    parts, hence the text is never parsed again.
+
+    Note: Only the named fields are supported. Positional fields, like
+    `{}` or `{0}` raise ValueError while parsing.
+    """
+
+    __slots__ = ('text', 'fields', '_parts')
+
+    def __init__(self, text: Text) -> None:
+        self.text = text
+        fields, parts = set(), []
+        for literal, field, spec, conversion in _formatter.parse(text):
+            if field is not None:
+                name = field.split('.', 1)[0].split('[', 1)[0]
+                if not name or name.isdigit():
+                    raise ValueError(f'Template "{text}" has positional '
+                                     'field.')
+                fields.add(name)
+            parts.append((literal, field, spec, conversion))
+        self.fields: FrozenSet[Text] = frozenset(fields)
+        self._parts = tuple(parts)
+
+    def __repr__(self) -> Text:
+        return f'Template({self.text!r})'
+
+    def render(self, values: Dict[Text, Any]) -> Text:
+        """Returns the template rendered with the values."""
+        if not self.fields:
+            return self.text
+        rendered = []
+        for literal, field, spec, conversion in self._parts:
+            rendered.append(literal)
+            if field is None:
+                continue
+            if field in values:
+                value = values[field]
+            else:
+                value = _formatter.get_field(field, (), values)[0]
+            if conversion:
+                value = _formatter.convert_field(value, conversion)
+            rendered.append(format(value, spec))
+        return ''.join(rendered)
+
+
+class Templates:
+    """Registry of the reply templates.
+
+    defaults: Values which are used by the templates unless they are
+              passed while rendering, for e.g: name of the user.
+              Default: None
+
+    Holds the groups of the templates by their keys. Every group is
+    parsed once while registering & one of it`s templates is selected
+    randomly while rendering.
+
+    Note: Rendering raises KeyError if any template of the group needs a
+    value which is not passed, even if that template is not selected.
+    """
+
+    def __init__(self, defaults: Optional[Dict[Text, Any]] = None) -> None:
+        self.defaults = dict(defaults or {})
+        self._groups = {}
+
+    def __contains__(self, key: Text) -> bool:
+        return key in self._groups
+
+    def __getitem__(self, key: Text) -> List[Template]:
+        return list(self._groups[key][0])
+
+    def register(self, key: Text, texts: Iterable[Text]) -> None:
+        """Registers group of the templates.
+
+        key:   Key of the group, for e.g: `weather.wait`.
+        texts: Texts of the templates in the group.
+        """
+        group = tuple(Template(text) for text in texts)
+        if not group:
+            raise ValueError(f'Template group "{key}" is empty.')
+        self._groups[key] = group, frozenset().union(*(template.fields
+                                                       for template in group))
+
+    def update(self, **groups: Dict[Text, Iterable[Text]]) -> None:
+        """Registers dictionaries of the templates.
+
+        Keys of the dictionaries are prefixed with the name they are
+        passed with, hence `update(weather={'wait': [...]})` registers
+        the `weather.wait` group.
+        """
+        for name, texts in groups.items():
+            for key, group in texts.items():
+                self.register(f'{name}.{key}', group)
+
+    def fields(self, key: Text) -> FrozenSet[Text]:
+        """Returns fields needed by the group of the templates."""
+        return self._groups[key][1]
+
+    def render(self, key: Text, **values: Any) -> Text:
+        """Renders template.
+
+        key:    Key of the group of the templates.
+        values: Values of the fields used by the templates.
+
+        Selects one of the templates of the group randomly & renders
+        only the selected template.
+        """
+        group, fields = self._groups[key]
+        missing = fields.difference(values, self.defaults)
+        if missing:
+            raise KeyError(f'Template group "{key}" needs '
+                           f'{", ".join(sorted(missing))}.')
+        if self.defaults:
+            values = {**self.defaults, **values}
+        return choice(group).render(values)
@@ -0,0 +1,281 @@
+"""
+The windows module: Provides functions for managing the windows.
+
+These classes help to find & minimize the windows of the system using a
+backend specific to the platform. Window titles are cached for a short
+while, hence repeated lookups do not enumerate every window again.
+
+At a glance, the structure of the module is following:
+ - WindowBackend():     Abstract backend which lists & minimizes the
+                        windows. Backends which can not signal the new
+                        windows are polled while waiting.
+ - Win32Backend():      Backend for the Windows platform using `ctypes`
+                        & `win32gui`.
+ - StubBackend():       In-memory backend used on the rest of platforms.
+                        Windows are opened & closed by hand, hence it is
+                        recommended for testing.
+ - WindowManager():     Finds the windows by their fuzzy titles using
+                        the cache of the titles & handles with a short
+                        time to live. Waits for the window to appear
+                        instead of sleeping for a fixed delay.
+ - window_manager():    Returns the window manager shared by the system
+                        module.
+
+See https://github.com/xames3/charlotte for cloning the repository.
+"""
+#   History:
+#
+#   < Checkout my GitHub repo for history and latest stable build >
+#
+#   2.1.0 - First code.
+
+import sys
+from abc import ABC, abstractmethod
+from itertools import count
+from threading import Condition, Lock
+from time import monotonic
+from typing import Any, Dict, List, Optional, Text, Tuple, Union
+
+from charlotte.utils.constants import WINDOW_POLL, WINDOW_TIMEOUT, WINDOW_TTL
+from charlotte.utils.matcher import ChoiceSet, match
+
+_manager = None
+
+
+class WindowBackend(ABC):
+    """Abstract window backend.
+
+    poll: Seconds between the listings while waiting for a window, used
+          if the backend can not signal the new windows.
+          Default: `WINDOW_POLL`
+
+    Lists & minimizes the windows of the platform. Backends which know
+    when the windows change call `notify`, hence the waiting windows are
+    found right away.
+    """
+
+    def __init__(self, poll: Union[float, int] = WINDOW_POLL) -> None:
+        self.poll = poll
+        self._changed = Condition()
+
+    @abstractmethod
+    def windows(self) -> Dict[Any, Text]:
+        """Returns titles of the visible windows keyed by their handle."""
+
+    @abstractmethod
+    def minimize(self, handle: Any) -> bool:
+        """Minimizes the window, returns False if it no longer exists."""
+
+    def notify(self) -> None:
+        """Wakes up the callers waiting for the windows to change."""
+        with self._changed:
+            self._changed.notify_all()
+
+    def wait(self, timeout: Union[float, int]) -> None:
+        """Waits till the windows change, at most `poll` seconds."""
+        with self._changed:
+            self._changed.wait(min(timeout, self.poll))
+
+
+class Win32Backend(WindowBackend):
+    """Window backend for the Windows platform.
+
+    Note: Windows can not be signalled without running a message loop,
+    hence they are polled every `poll` seconds while waiting.
+    """
+
+    def windows(self) -> Dict[Any, Text]:
+        # You can find the reference code here:
+        # https://sjohannes.wordpress.com/2012/03/23/win32-python-getting-
+        # all-window-titles/
+        import ctypes
+
+        EnumWindowsProc = ctypes.WINFUNCTYPE(ctypes.c_bool,
+                                             ctypes.POINTER(ctypes.c_int),
+                                             ctypes.POINTER(ctypes.c_int))
+        user32 = ctypes.windll.user32
+        titles = {}
+
+        def _each_window(hwnd: Any, lParam: Any) -> bool:
+            """Function which pulls title of each visible window."""
+            if user32.IsWindowVisible(hwnd):
+                length = user32.GetWindowTextLengthW(hwnd)
+                if length:
+                    buff = ctypes.create_unicode_buffer(length + 1)
+                    user32.GetWindowTextW(hwnd, buff, length + 1)
+                    titles[ctypes.cast(hwnd, ctypes.c_void_p).value] = \
+                        buff.value
+            return True
+
+        user32.EnumWindows(EnumWindowsProc(_each_window), 0)
+        return titles
+
+    def minimize(self, handle: Any) -> bool:
+        from win32con import SW_MINIMIZE
+        from win32gui import IsWindow, ShowWindow
+
+        if not IsWindow(handle):
+            return False
+        ShowWindow(handle, SW_MINIMIZE)
+        return True
+
+
+class StubBackend(WindowBackend):
+    """In-memory window backend.
+
+    Windows are opened & closed by hand using `open` & `close`. Waiting
+    callers are notified as soon as a window is opened.
+    """
+
+    def __init__(self, poll: Union[float, int] = WINDOW_POLL) -> None:
+        super().__init__(poll)
+        self.minimized = set()
+        self._windows: Dict[int, Text] = {}
+        self._handles = count(1)
+        self._lock = Lock()
+
+    def open(self, title: Text) -> int:
+        """Opens a window & returns it`s handle."""
+        with self._lock:
+            handle = next(self._handles)
+            self._windows[handle] = title
+        self.notify()
+        return handle
+
+    def close(self, handle: int) -> None:
+        """Closes the window."""
+        with self._lock:
+            self._windows.pop(handle, None)
+            self.minimized.discard(handle)
+        self.notify()
+
+    def windows(self) -> Dict[Any, Text]:
+        with self._lock:
+            return dict(self._windows)
+
+    def minimize(self, handle: Any) -> bool:
+        with self._lock:
+            if handle not in self._windows:
+                return False
+            self.minimized.add(handle)
+            return True
+
+    def wait(self, timeout: Union[float, int]) -> None:
+        with self._changed:
+            self._changed.wait(timeout)
+
+
+class WindowManager:
+    """Finds windows by their fuzzy titles.
+
+    backend: Backend of the platform.
+             Default: None (`Win32Backend` on Windows, else `StubBackend`)
+    ttl:     Seconds for which the titles of the windows are cached.
+             Default: `WINDOW_TTL`
+
+    Caches the handles of the windows along with their titles, hence
+    the windows sharing the same title are all kept. The windows are
+    listed again only if the cache is older than `ttl`, or if the window
+    is not found in the cache. The cache is shared by the threads, hence
+    it is guarded by a lock.
+
+    Note: Cached handles can be stale. If minimizing a cached handle
+    fails, the windows are listed again before giving up.
+    """
+
+    def __init__(self,
+                 backend: Optional[WindowBackend] = None,
+                 ttl: Union[float, int] = WINDOW_TTL) -> None:
+        if backend is None:
+            backend = Win32Backend() if sys.platform == 'win32' \
+                else StubBackend()
+        self.backend = backend
+        self.ttl = ttl
+        self._windows: List[Tuple[Any, Text]] = []
+        self._updated = None
+        self._lock = Lock()
+        self._titles = ChoiceSet(lambda: [title for _, title
+                                          in self._windows],
+                                 version=lambda: self._updated)
+
+    def _refresh(self, force: Optional[bool] = False) -> None:
+        """Lists the windows again, the lock needs to be held."""
+        now = monotonic()
+        if force or self._updated is None or now - self._updated >= self.ttl:
+            self._windows = list(self.backend.windows().items())
+            self._updated = now
+
+    def refresh(self, force: Optional[bool] = False) -> None:
+        """Lists the windows again if the cache has expired."""
+        with self._lock:
+            self._refresh(force)
+
+    def titles(self) -> List[Text]:
+        """Returns titles of the visible windows."""
+        with self._lock:
+            self._refresh()
+            return [title for _, title in self._windows]
+
+    def find(self,
+             window_name: Text,
+             min_score: Optional[int] = 70) -> Optional[Any]:
+        """Returns handle of the window, None if it is not found."""
+        with self._lock:
+            self._refresh()
+            best = match(window_name, self._titles, min_score)
+            if best is None:
+                # Window could have opened after the cache was filled.
+                self._refresh(force=True)
+                best = match(window_name, self._titles, min_score)
+            # Index of the match is used, hence the windows sharing the
+            # same title are told apart by their handles.
+            return self._windows[best[2]][0] if best else None
+
+    def wait_for(self,
+                 window_name: Text,
+                 timeout: Union[float, int] = WINDOW_TIMEOUT,
+                 min_score: Optional[int] = 70) -> Optional[Any]:
+        """Waits for the window to appear & returns it`s handle.
+
+        window_name: Name of the window, the name can be fuzzy.
+        timeout:     Seconds after which the waiting is given up.
+                     Default: `WINDOW_TIMEOUT`
+        min_score:   Minimum score needed to make an approximate guess.
+                     Default: 70
+
+        Returns as soon as the window is found, hence a window which is
+        already open is returned without any delay. Returns None if the
+        window does not appear before the timeout.
+        """
+        deadline = monotonic() + timeout
+        handle = self.find(window_name, min_score)
+        while handle is None and monotonic() < deadline:
+            self.backend.wait(deadline - monotonic())
+            handle = self.find(window_name, min_score)
+        return handle
+
+    def minimize(self,
+                 window_name: Text,
+                 timeout: Union[float, int] = WINDOW_TIMEOUT) -> bool:
+        """Minimizes the window, returns False if it is not found."""
+        handle = self.wait_for(window_name, timeout)
+        if handle is None:
+            return False
+        if self.backend.minimize(handle):
+            return True
+        # Cached handle is stale, hence the windows are listed again.
+        self.refresh(force=True)
+        handle = self.find(window_name)
+        return handle is not None and self.backend.minimize(handle)
+
+
+def window_manager() -> WindowManager:
+    """Returns window manager.
+
+    Returns the window manager shared by the system module. The manager
+    uses the backend of the current platform.
+    """
+    global _manager
+    if _manager is None:
+        _manager = WindowManager()
+    return _manager